@@ -14,6 +14,7 @@ import logging
 import json
 from datetime import datetime
 from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import raiseload, selectinload
 
 from .auth import require_auth
 from .database import get_db_session, User, Tenant, AuditLog, Administrator
@@ -104,7 +105,8 @@ def list_users():
     try:
         session = get_db_session()
         try:
-            users = session.query(User).all()
+            # User.to_dict needs no relationships; fail loudly on any lazy load
+            users = session.query(User).options(raiseload('*')).all()
             users_data = []
             for user in users:
                 user_dict = user.to_dict()
@@ -231,7 +233,8 @@ def list_tenants():
     try:
         session = get_db_session()
         try:
-            tenants = session.query(Tenant).all()
+            # Load all tenants' users in one extra SELECT instead of one per tenant
+            tenants = session.query(Tenant).options(selectinload(Tenant.users)).all()
             return jsonify({"success": True, "tenants": [tenant.to_dict(include_users=True) for tenant in tenants]}), 200
         finally:
             session.close()
@@ -14,8 +14,8 @@ from typing import Optional, Dict, Any, List
 import pytz
 
 from agents import Agent, Runner
-from .mail_me_handler import MailMeHandler
-from .memory_service import get_memory_service, add_conversation_memory, get_memory_context
+from .mail_me_handler import MailMeHandler, is_mail_me_command
+from .memory_service import get_memory_service, add_conversation_memory, get_memory_context_async
 
 logger = logging.getLogger(__name__)
 
@@ -142,7 +142,7 @@ def classify_message(message: str) -> str:
             return 'help'
 
     # 1. Check for 'mail me' command (highest priority)
-    if MailMeHandler.is_mail_me_command(message):
+    if is_mail_me_command(message):
         return 'mail_me'
 
     # 2. Check for CRM STORE commands (store, save, add to CRM)
@@ -735,7 +735,7 @@ async def process_message(
         logger.info(f"[agents.py] Message classified as: {message_type}")
         
         # Get memory context for personalization
-        memory_context = get_memory_context(message, phone_number)
+        memory_context = await get_memory_context_async(message, phone_number)
         if memory_context:
             logger.info(f"[agents.py] Retrieved memory context for user")
         
@@ -17,7 +17,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from pathlib import Path
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import create_engine, event, Column, Integer, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from sqlalchemy.pool import StaticPool
@@ -220,6 +220,19 @@ class AuditLog(Base):
 # Database Connection and Session Management
 # ============================================================================
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Enable WAL journaling with synchronous=NORMAL on new SQLite connections.
+    
+    Commits then append to the write-ahead log without an fsync each; the log
+    is synced at checkpoints. Readers no longer block the writer.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 class DatabaseManager:
     """Manages database connection and session lifecycle"""
     
@@ -265,6 +278,7 @@ class DatabaseManager:
                 connect_args={'check_same_thread': False},
                 poolclass=StaticPool
             )
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         else:
             # For PostgreSQL and other databases
             # Use connection pooling for production
@@ -12,7 +12,10 @@ import logging
 import os
 import json
 import base64
-from typing import Optional, List, Dict, Any, Union
+import functools
+from email.header import Header
+from email.mime.text import MIMEText
+from typing import Optional, List, Dict, Any, Callable, Set, Union
 from google.auth.transport.requests import Request
 from google.oauth2.service_account import Credentials
 from google.oauth2.credentials import Credentials as UserCredentials
@@ -20,9 +23,133 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.exceptions import RefreshError
 import googleapiclient.discovery
 from googleapiclient.errors import HttpError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 logger = logging.getLogger(__name__)
 
+# orjson parses token payloads noticeably faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_b64encode = base64.urlsafe_b64encode
+
+# Transient Gmail API statuses worth retrying (rate limit + server errors)
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses meaning the request was rejected before it was processed, so even
+# a non-idempotent request (sending mail) can safely be repeated
+_RATE_LIMIT_STATUSES = frozenset({429})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Return True for HttpErrors caused by rate limiting or transient server errors"""
+    return isinstance(exc, HttpError) and exc.resp.status in _RETRYABLE_STATUSES
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """Return True for HttpErrors caused by rate limiting"""
+    return isinstance(exc, HttpError) and exc.resp.status in _RATE_LIMIT_STATUSES
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_exponential_jitter(multiplier=0.5, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+def _execute(request) -> Dict[str, Any]:
+    """Execute a Gmail API request, retrying 429/5xx with exponential backoff and jitter"""
+    return request.execute()
+
+
+@retry(
+    retry=retry_if_exception(_is_rate_limited),
+    wait=wait_exponential_jitter(multiplier=0.5, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+def _execute_send(request) -> Dict[str, Any]:
+    """
+    Execute a Gmail send request, retrying only 429
+
+    A 5xx may come after Gmail already accepted the message, so retrying
+    it could deliver the email twice.
+    """
+    return request.execute()
+
+
+def _gmail_call(error_message: str, default_factory: Callable[[], Any]):
+    """
+    Decorator for Gmail API methods: an HttpError is logged and the method
+    returns default_factory() instead of raising.
+    
+    The service is guaranteed to exist once __init__ returns, since
+    _authenticate raises on failure, so methods need no guard of their own.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except HttpError as e:
+                logger.error(f"{error_message}: {str(e)}")
+                logger.debug(f"Error details: {getattr(e, 'content', 'No details')}")
+                return default_factory()
+        return wrapper
+    return decorator
+
+
+def build_raw_message(to: str, subject: str, body: str) -> bytes:
+    """
+    Build the RFC 5322 message bytes for a plain-text email
+    
+    Headers are assembled directly instead of going through the email package's
+    MIME generator: an ASCII body is sent as 7bit us-ascii, anything else as
+    base64 UTF-8, and a non-ASCII subject is RFC 2047 encoded. Unusual
+    recipients (non-ASCII or containing line breaks) fall back to MIMEText.
+    
+    Args:
+        to (str): Recipient email address
+        subject (str): Email subject
+        body (str): Email body (plain text)
+        
+    Returns:
+        bytes: Raw message, ready for base64url encoding
+    """
+    if not to.isascii() or '\r' in to or '\n' in to or '\r' in subject or '\n' in subject:
+        message = MIMEText(body, _charset='utf-8')
+        message['to'] = to
+        message['subject'] = subject
+        return message.as_bytes()
+    
+    if not subject.isascii():
+        subject = Header(subject, 'utf-8').encode(linesep='\r\n')
+    
+    if body.isascii():
+        charset, transfer_encoding, payload = 'us-ascii', '7bit', body.encode('ascii')
+    else:
+        charset, transfer_encoding, payload = 'utf-8', 'base64', base64.encodebytes(body.encode('utf-8'))
+    
+    headers = (
+        f"To: {to}\r\n"
+        f"Subject: {subject}\r\n"
+        f"MIME-Version: 1.0\r\n"
+        f"Content-Type: text/plain; charset=\"{charset}\"\r\n"
+        f"Content-Transfer-Encoding: {transfer_encoding}\r\n"
+        f"\r\n"
+    )
+    return headers.encode('ascii') + payload
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON using orjson when installed, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class GoogleEmailClient:
     """
@@ -52,6 +179,8 @@ class GoogleEmailClient:
         self.client_secrets_path = client_secrets_path
         self.credentials = None
         self.service = None
+        self._messages = None
+        self._labels = None
         self._authenticate()
     
     def _load_token_data(self) -> Dict[str, Any]:
@@ -71,8 +200,7 @@ class GoogleEmailClient:
             env_value = os.getenv('GOOGLE_USER_TOKEN_JSON')
             if env_value:
                 try:
-                    decoded = base64.b64decode(env_value).decode('utf-8')
-                    token_data = json.loads(decoded)
+                    token_data = _json_loads(base64.b64decode(env_value))
                     logger.info("✅ Loaded Google User Token from Base64 environment variable")
                     return token_data
                 except Exception as e:
@@ -83,8 +211,8 @@ class GoogleEmailClient:
             if not os.path.exists(self.token_source):
                 raise FileNotFoundError(f"Token file not found: {self.token_source}")
             
-            with open(self.token_source, 'r') as f:
-                token_data = json.load(f)
+            with open(self.token_source, 'rb') as f:
+                token_data = _json_loads(f.read())
             logger.info(f"✅ Loaded Google User Token from file: {self.token_source}")
             return token_data
         except Exception as e:
@@ -114,6 +242,11 @@ class GoogleEmailClient:
             
             # Build Gmail service
             self.service = googleapiclient.discovery.build('gmail', 'v1', credentials=self.credentials)
+            
+            # Resource builders allocate new objects on every call - bind them once
+            users = self.service.users()
+            self._messages = users.messages()
+            self._labels = users.labels()
             logger.info(f"✅ Gmail service initialized")
         
         except FileNotFoundError as e:
@@ -128,6 +261,7 @@ class GoogleEmailClient:
             logger.error(f"Authentication error: {str(e)}")
             raise
     
+    @_gmail_call("Error getting inbox count", int)
     def get_inbox_count(self) -> int:
         """
         Get count of unread emails in inbox
@@ -135,74 +269,72 @@ class GoogleEmailClient:
         Returns:
             int: Number of unread emails
         """
-        try:
-            if not self.service:
-                logger.error("Gmail service not initialized")
-                return 0
-            
-            results = self.service.users().labels().get(
-                userId='me',
-                id='INBOX'
-            ).execute()
-            
-            unread_count = results.get('messagesUnread', 0)
-            logger.info(f"Unread emails in inbox: {unread_count}")
-            return unread_count
+        results = _execute(self._labels.get(
+            userId='me',
+            id='INBOX'
+        ))
         
-        except HttpError as e:
-            logger.error(f"Error getting inbox count: {str(e)}")
-            return 0
+        unread_count = results.get('messagesUnread', 0)
+        logger.info(f"Unread emails in inbox: {unread_count}")
+        return unread_count
     
-    def list_emails(self, query: str = "is:unread", max_results: int = 10) -> List[Dict[str, Any]]:
+    @_gmail_call("Error listing emails", list)
+    def list_emails(self, query: str = "is:unread", max_results: int = 10,
+                    fields_needed: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """
         List emails matching query
         
         Args:
             query (str): Gmail search query (e.g., "is:unread", "from:example@gmail.com")
             max_results (int): Maximum number of results to return
+            fields_needed (set, optional): Subset of 'id', 'from', 'subject', 'date', 'snippet'
+                to return. Defaults to all fields. Leaving out 'snippet' drops it from the
+                API response; asking only for 'id' skips the per-message fetch entirely.
             
         Returns:
             list: List of email dictionaries with id and snippet
         """
-        try:
-            if not self.service:
-                logger.error("Gmail service not initialized")
-                return []
-            
-            results = self.service.users().messages().list(
+        results = _execute(self._messages.list(
+            userId='me',
+            q=query,
+            maxResults=max_results
+        ))
+        
+        messages = results.get('messages', [])
+        logger.info(f"Found {len(messages)} emails matching query: {query}")
+        
+        # IDs only (e.g. counting) - no per-message fetch required
+        if fields_needed is not None and fields_needed <= {'id'}:
+            return [{'id': message['id']} for message in messages]
+        
+        include_snippet = fields_needed is None or 'snippet' in fields_needed
+        get_kwargs = {} if include_snippet else {'fields': 'payload/headers'}
+        
+        emails = []
+        for message in messages:
+            msg = _execute(self._messages.get(
                 userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
+                id=message['id'],
+                format='metadata',
+                metadataHeaders=['From', 'Subject', 'Date'],
+                **get_kwargs
+            ))
             
-            messages = results.get('messages', [])
-            logger.info(f"Found {len(messages)} emails matching query: {query}")
+            headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
             
-            emails = []
-            for message in messages:
-                msg = self.service.users().messages().get(
-                    userId='me',
-                    id=message['id'],
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date']
-                ).execute()
-                
-                headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
-                
-                emails.append({
-                    'id': message['id'],
-                    'from': headers.get('From', 'Unknown'),
-                    'subject': headers.get('Subject', 'No Subject'),
-                    'date': headers.get('Date', 'Unknown'),
-                    'snippet': msg.get('snippet', '')
-                })
-            
-            return emails
+            email = {
+                'id': message['id'],
+                'from': headers.get('From', 'Unknown'),
+                'subject': headers.get('Subject', 'No Subject'),
+                'date': headers.get('Date', 'Unknown'),
+            }
+            if include_snippet:
+                email['snippet'] = msg.get('snippet', '')
+            emails.append(email)
         
-        except HttpError as e:
-            logger.error(f"Error listing emails: {str(e)}")
-            return []
+        return emails
     
+    @_gmail_call("❌ Gmail API HttpError when sending email", bool)
     def send_email(self, to: str, subject: str, body: str) -> bool:
         """
         Send an email via Gmail API
@@ -216,33 +348,22 @@ class GoogleEmailClient:
             bool: True if email sent successfully, False otherwise
         """
         try:
-            if not self.service:
-                logger.error("Gmail service not initialized - cannot send email")
-                return False
-            
             if not to or not subject or body is None:
                 logger.error(f"Invalid email parameters - to: {to}, subject: {subject}, body length: {len(body) if body else 0}")
                 return False
             
-            from email.mime.text import MIMEText
-            
-            # Create MIME message
-            message = MIMEText(body)
-            message['to'] = to
-            message['subject'] = subject
-            
             # Encode message
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            raw_message = _b64encode(build_raw_message(to, subject, body)).decode('ascii')
             send_message = {'raw': raw_message}
             
             logger.info(f"Attempting to send email to {to} with subject: {subject}")
             logger.debug(f"Email body length: {len(body)} characters")
             
             # Send email via Gmail API
-            result = self.service.users().messages().send(
+            result = _execute_send(self._messages.send(
                 userId='me',
                 body=send_message
-            ).execute()
+            ))
             
             # Verify result
             if result and 'id' in result:
@@ -257,15 +378,15 @@ class GoogleEmailClient:
                 logger.error(f"Gmail API returned unexpected response: {result}")
                 return False
         
-        except HttpError as e:
-            logger.error(f"❌ Gmail API HttpError when sending email: {str(e)}")
-            logger.error(f"Error details: {e.content if hasattr(e, 'content') else 'No details'}")
-            return False
+        except HttpError:
+            # Logged and converted to False by @_gmail_call
+            raise
         
         except Exception as e:
             logger.error(f"❌ Unexpected error sending email: {str(e)}", exc_info=True)
             return False
     
+    @_gmail_call("Error getting email body", str)
     def get_email_body(self, message_id: str) -> str:
         """
         Get full email body
@@ -276,34 +397,26 @@ class GoogleEmailClient:
         Returns:
             str: Email body text
         """
-        try:
-            if not self.service:
-                logger.error("Gmail service not initialized")
-                return ""
-            
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-            
-            # Extract body from message
-            if 'parts' in message['payload']:
-                parts = message['payload']['parts']
-                data = parts[0]['body'].get('data', '')
-            else:
-                data = message['payload']['body'].get('data', '')
-            
-            if data:
-                text = base64.urlsafe_b64decode(data).decode('utf-8')
-                return text
-            
-            return ""
+        message = _execute(self._messages.get(
+            userId='me',
+            id=message_id,
+            format='full'
+        ))
         
-        except HttpError as e:
-            logger.error(f"Error getting email body: {str(e)}")
-            return ""
+        # Extract body from message
+        if 'parts' in message['payload']:
+            parts = message['payload']['parts']
+            data = parts[0]['body'].get('data', '')
+        else:
+            data = message['payload']['body'].get('data', '')
+        
+        if data:
+            text = base64.urlsafe_b64decode(data).decode('utf-8')
+            return text
+        
+        return ""
     
+    @_gmail_call("Error marking email as read", bool)
     def mark_as_read(self, message_id: str) -> bool:
         """
         Mark email as read
@@ -314,20 +427,11 @@ class GoogleEmailClient:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            if not self.service:
-                logger.error("Gmail service not initialized")
-                return False
-            
-            self.service.users().messages().modify(
-                userId='me',
-                id=message_id,
-                body={'removeLabelIds': ['UNREAD']}
-            ).execute()
-            
-            logger.info(f"Email {message_id} marked as read")
-            return True
+        _execute(self._messages.modify(
+            userId='me',
+            id=message_id,
+            body={'removeLabelIds': ['UNREAD']}
+        ))
         
-        except HttpError as e:
-            logger.error(f"Error marking email as read: {str(e)}")
-            return False
+        logger.info(f"Email {message_id} marked as read")
+        return True
@@ -5,13 +5,96 @@ Handles "mail me" commands to send structured emails to user's own email address
 File location: pareto_agents/mail_me_handler.py
 """
 
+import base64
+import functools
 import logging
 import re
-from typing import Dict, Optional, Tuple
+import string
+import time
+from typing import Any, Dict, Optional, Tuple
 from pydantic import BaseModel, Field, EmailStr
+from google.oauth2.credentials import Credentials as UserCredentials
+from google.auth.transport.requests import Request
+import googleapiclient.discovery
+
+from .config_loader_v2 import get_google_user_token_by_phone
+from .google_email_client import GoogleEmailClient, build_raw_message
 
 logger = logging.getLogger(__name__)
 
+# Messages longer than this bypass the is_mail_me_command LRU cache so the
+# cache never pins large strings in memory
+_MAX_CACHED_MESSAGE_LENGTH = 512
+
+# Built Gmail services per phone number: phone -> (expires_at, service, credentials).
+# Skips the DB token lookup and discovery build on repeated sends; the TTL
+# bounds how long a token re-authorized in the database can go unnoticed.
+_GMAIL_SERVICE_TTL_SECONDS = 1800
+_gmail_service_cache: Dict[str, Tuple[float, Any, Any]] = {}
+
+# Direct mail-to-self prefixes (English, Swedish, Croatian), checked with a
+# single str.startswith call against the stripped, lowercased message
+_DIRECT_PREFIXES = ("mail me", "email me", "mejla mig", "maila mig", "pošalji mi", "mejlaj mi")
+
+# First letters of every mail-to-self command (mail/mejla, email, send/skicka,
+# pošalji, napiši); anything else is rejected without running a regex
+_COMMAND_FIRST_CHARS = frozenset('mespn')
+
+# "Send me" command patterns, fused into a single alternation so detection
+# is one regex call. Matched against the stripped, lowercased message.
+_SEND_ME_ALTERNATION = (
+    # English: "send me an email", "send an email to me"
+    r'send\s+me\s+(?:an?\s+)?(?:email|mail|message)'
+    r'|send\s+(?:an?\s+)?(?:email|mail|message)\s+to\s+me'
+    # Swedish: "skicka mig ett mejl", "skicka ett mejl till mig"
+    r'|skicka\s+mig\s+(?:ett?\s+)?(?:mejl|mail|meddelande)'
+    r'|skicka\s+(?:ett?\s+)?(?:mejl|mail|meddelande)\s+till\s+mig'
+    # Croatian: "pošalji mi mail", "pošalji mail meni"
+    r'|pošalji\s+mi\s+(?:jedan?\s+)?(?:e-?mail|mail|poruku)'
+    r'|pošalji\s+(?:jedan?\s+)?(?:e-?mail|mail|poruku)\s+meni'
+    r'|napiši\s+mi\s+(?:jedan?\s+)?(?:e-?mail|mail|poruku)'
+)
+_MAIL_ME_CMD_RE = re.compile(r'^(?:' + _SEND_ME_ALTERNATION + r')')
+
+# Command prefixes stripped by extract_mail_me_content, in order of specificity
+_EXTRACT_ALTERNATION = (
+    # English patterns
+    r'send\s+me\s+(?:an?\s+)?(?:email|mail|message)\s+(?:that\s+)?'  # "send me an email that..."
+    r'|send\s+(?:an?\s+)?(?:email|mail|message)\s+to\s+me\s+(?:that\s+)?'  # "send an email to me that..."
+    r'|(?:mail|email)\s+me\s+(?:that\s+)?'  # "mail me that..." or "email me that..."
+    # Swedish patterns
+    r'|skicka\s+mig\s+(?:ett?\s+)?(?:mejl|mail|meddelande)\s+(?:att\s+|om\s+)?'  # "skicka mig ett mejl att..."
+    r'|skicka\s+(?:ett?\s+)?(?:mejl|mail|meddelande)\s+till\s+mig\s+(?:att\s+|om\s+)?'  # "skicka ett mejl till mig att..."
+    r'|(?:mejla|maila)\s+mig\s+(?:att\s+|om\s+)?'  # "mejla mig att..." or "maila mig om..."
+    # Croatian patterns
+    r'|pošalji\s+mi\s+(?:jedan?\s+)?(?:e-?mail|mail|poruku)\s+(?:da\s+|o\s+)?'  # "pošalji mi mail da..."
+    r'|pošalji\s+(?:jedan?\s+)?(?:e-?mail|mail|poruku)\s+meni\s+(?:da\s+|o\s+)?'  # "pošalji mail meni da..."
+    r'|(?:mejlaj|napiši)\s+mi\s+(?:da\s+|o\s+)?'  # "mejlaj mi da..." or "napiši mi o..."
+)
+_EXTRACT_RE = re.compile(r'^(?:' + _EXTRACT_ALTERNATION + r')', re.IGNORECASE)
+
+# Detection and extraction in one pass: the lookahead accepts exactly what
+# is_mail_me_command accepts, the optional prefix is what
+# extract_mail_me_content strips, and group 1 captures the remaining content.
+_MAIL_ME_FULL_RE = re.compile(
+    r'^(?=' + '|'.join(map(re.escape, _DIRECT_PREFIXES)) + '|' + _SEND_ME_ALTERNATION + r')'
+    r'(?:' + _EXTRACT_ALTERNATION + r')?(.*)$',
+    re.IGNORECASE | re.DOTALL
+)
+
+# ASCII-only lowercasing table: keeps string length (and so offsets) intact,
+# unlike str.lower() on some non-ASCII characters
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Line classifiers for structure_email_body (substring match against the
+# lowercased line, so the patterns themselves need no IGNORECASE)
+_WORK_KEYWORDS = ('need', 'require', 'should', 'must')
+_ESTIMATE_KEYWORDS = ('time', 'cost', 'price', 'day', 'hour', 'euro', '$', '€')
+_WORK_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _WORK_KEYWORDS)))
+_ESTIMATE_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _ESTIMATE_KEYWORDS)))
+
 
 class MailMeRequest(BaseModel):
     """Structured request for mail me command"""
@@ -33,212 +116,326 @@ class MailMeRequest(BaseModel):
         }
 
 
-class MailMeHandler:
+def _normalize(message: str) -> Tuple[str, str]:
     """
-    Handles "mail me" commands
-    Parses message content and creates structured emails
+    Strip and lowercase a message once for the detection/extraction helpers
+    
+    Returns:
+        tuple: (stripped message, stripped lowercased message)
     """
+    stripped = message.strip()
+    return stripped, stripped.lower()
+
+
+def _may_be_command(message: str) -> bool:
+    """Prefilter: every command starts with one of _COMMAND_FIRST_CHARS"""
+    stripped = message.lstrip()
+    return bool(stripped) and stripped[0].lower() in _COMMAND_FIRST_CHARS
+
+
+def _matches_command(message_lower: str) -> bool:
+    """Detect a mail-to-self command in an already stripped, lowercased message"""
+    if message_lower.startswith(_DIRECT_PREFIXES):
+        return True
     
-    @staticmethod
-    def is_mail_me_command(message: str) -> bool:
-        """
-        Check if message is a "mail me" / "email me" / "send me" command (send to self)
-        
-        Recognizes patterns in English, Swedish, and Croatian like:
-        - "mail me ..." / "email me ..."
-        - "send me an email ..." / "send me a mail ..."
-        - "send an email to me ..."
-        - Swedish: "mejla mig ...", "skicka mig ett mejl ..."
-        - Croatian: "pošalji mi mail ...", "pošalji mi e-mail ..."
-        
-        Args:
-            message (str): User's message
-            
-        Returns:
-            bool: True if message is a mail-to-self command
-        """
-        message_lower = message.strip().lower()
-        
-        # Direct patterns: "mail me" or "email me" at start (English)
-        if message_lower.startswith("mail me") or message_lower.startswith("email me"):
-            return True
-        
-        # Swedish direct patterns: "mejla mig", "maila mig"
-        if message_lower.startswith("mejla mig") or message_lower.startswith("maila mig"):
-            return True
-        
-        # Croatian direct patterns: "pošalji mi", "mejlaj mi"
-        if message_lower.startswith("pošalji mi") or message_lower.startswith("mejlaj mi"):
-            return True
-        
-        # "Send me" patterns: "send me an email", "send me a mail", etc.
-        # Includes English, Swedish, and Croatian patterns
-        send_me_patterns = [
-            # English
-            r'^send\s+me\s+(an?\s+)?(email|mail|message)',
-            r'^send\s+(an?\s+)?(email|mail|message)\s+to\s+me',
-            # Swedish: "skicka mig ett mejl", "skicka ett mejl till mig"
-            r'^skicka\s+mig\s+(ett?\s+)?(mejl|mail|meddelande)',
-            r'^skicka\s+(ett?\s+)?(mejl|mail|meddelande)\s+till\s+mig',
-            # Croatian: "pošalji mi mail", "pošalji mail meni"
-            r'^pošalji\s+mi\s+(jedan?\s+)?(e-?mail|mail|poruku)',
-            r'^pošalji\s+(jedan?\s+)?(e-?mail|mail|poruku)\s+meni',
-            r'^napiši\s+mi\s+(jedan?\s+)?(e-?mail|mail|poruku)',
-        ]
-        
-        for pattern in send_me_patterns:
-            if re.match(pattern, message_lower):
-                return True
+    return _MAIL_ME_CMD_RE.match(message_lower) is not None
+
+
+def _strip_command_prefix(stripped: str) -> str:
+    """Remove the command prefix from an already stripped message"""
+    match = _EXTRACT_RE.match(stripped)
+    if match:
+        return stripped[match.end():].strip()
+    
+    # Fallback: return original message
+    return stripped
+
+
+def is_mail_me_command(message: str) -> bool:
+    """
+    Check if message is a "mail me" / "email me" / "send me" command (send to self)
+    
+    Recognizes patterns in English, Swedish, and Croatian like:
+    - "mail me ..." / "email me ..."
+    - "send me an email ..." / "send me a mail ..."
+    - "send an email to me ..."
+    - Swedish: "mejla mig ...", "skicka mig ett mejl ..."
+    - Croatian: "pošalji mi mail ...", "pošalji mi e-mail ..."
+    
+    Args:
+        message (str): User's message
         
+    Returns:
+        bool: True if message is a mail-to-self command
+    """
+    # Cheap reject for the common case before any lowercasing or regex work
+    if not _may_be_command(message):
         return False
+    if len(message) > _MAX_CACHED_MESSAGE_LENGTH:
+        return _matches_command(_normalize(message)[1])
+    return _is_mail_me_command_cached(message)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_mail_me_command_cached(message: str) -> bool:
+    """Memoized detection for short messages re-classified across retries"""
+    return _matches_command(_normalize(message)[1])
+
+
+def extract_mail_me_content(message: str) -> str:
+    """
+    Extract content after mail-to-self command patterns
     
-    @staticmethod
-    def extract_mail_me_content(message: str) -> str:
-        """
-        Extract content after mail-to-self command patterns
-        
-        Handles patterns in English, Swedish, and Croatian like:
-        - "mail me ..." -> extracts content after "mail me"
-        - "email me ..." -> extracts content after "email me"
-        - "send me an email ..." -> extracts content after "send me an email"
-        - Swedish: "mejla mig ..." -> extracts content after "mejla mig"
-        - Croatian: "pošalji mi mail ..." -> extracts content after "pošalji mi mail"
-        
-        Args:
-            message (str): User's message with mail-to-self command
-            
-        Returns:
-            str: Content to be mailed
-        """
-        # Try different patterns in order of specificity
-        # Includes English, Swedish, and Croatian patterns
-        patterns = [
-            # English patterns
-            r'^send\s+me\s+(an?\s+)?(email|mail|message)\s+(that\s+)?',  # "send me an email that..."
-            r'^send\s+(an?\s+)?(email|mail|message)\s+to\s+me\s+(that\s+)?',  # "send an email to me that..."
-            r'^(mail|email)\s+me\s+(that\s+)?',  # "mail me that..." or "email me that..."
-            # Swedish patterns
-            r'^skicka\s+mig\s+(ett?\s+)?(mejl|mail|meddelande)\s+(att\s+|om\s+)?',  # "skicka mig ett mejl att..."
-            r'^skicka\s+(ett?\s+)?(mejl|mail|meddelande)\s+till\s+mig\s+(att\s+|om\s+)?',  # "skicka ett mejl till mig att..."
-            r'^(mejla|maila)\s+mig\s+(att\s+|om\s+)?',  # "mejla mig att..." or "maila mig om..."
-            # Croatian patterns
-            r'^pošalji\s+mi\s+(jedan?\s+)?(e-?mail|mail|poruku)\s+(da\s+|o\s+)?',  # "pošalji mi mail da..."
-            r'^pošalji\s+(jedan?\s+)?(e-?mail|mail|poruku)\s+meni\s+(da\s+|o\s+)?',  # "pošalji mail meni da..."
-            r'^(mejlaj|napiši)\s+mi\s+(da\s+|o\s+)?',  # "mejlaj mi da..." or "napiši mi o..."
-        ]
-        
-        for pattern in patterns:
-            content = re.sub(pattern, '', message, flags=re.IGNORECASE).strip()
-            if content != message.strip():  # Pattern matched and removed something
-                return content
+    Handles patterns in English, Swedish, and Croatian like:
+    - "mail me ..." -> extracts content after "mail me"
+    - "email me ..." -> extracts content after "email me"
+    - "send me an email ..." -> extracts content after "send me an email"
+    - Swedish: "mejla mig ..." -> extracts content after "mejla mig"
+    - Croatian: "pošalji mi mail ..." -> extracts content after "pošalji mi mail"
+    
+    Args:
+        message (str): User's message with mail-to-self command
         
-        # Fallback: return original message
-        return message.strip()
+    Returns:
+        str: Content to be mailed
+    """
+    return _strip_command_prefix(message.strip())
+
+
+def classify(message: str) -> Optional[str]:
+    """
+    Detect a mail-to-self command and extract its content in one pass
     
-    @staticmethod
-    def generate_subject_from_content(content: str, max_length: int = 100) -> str:
-        """
-        Generate a structured subject line from message content
+    Equivalent to calling is_mail_me_command() followed by
+    extract_mail_me_content(), but runs a single regex match.
+    
+    Args:
+        message (str): User's message
         
-        Extracts key information and creates a concise subject
+    Returns:
+        str or None: Content to be mailed, or None if not a mail-to-self command
+    """
+    if not _may_be_command(message):
+        return None
+    match = _MAIL_ME_FULL_RE.match(message.strip())
+    return match.group(1).strip() if match else None
+
+
+def _find_work_item(content: str) -> Optional[Tuple[str, str]]:
+    """
+    Find the first "X need(s) (to) (be) Y" phrase in whitespace-normalized text
+    
+    Linear str.find scan equivalent to matching
+    ([^.,]+?)\\s+needs?\\s+(?:to\\s+)?(?:be\\s+)?([^.,]+) case-insensitively,
+    without the regex backtracking on long messages.
+    
+    Args:
+        content (str): Text with whitespace runs collapsed to single spaces
         
-        Args:
-            content (str): Message content
-            max_length (int): Maximum subject length
+    Returns:
+        tuple or None: Unstripped (item, action), or None if there is no work item
+    """
+    folded = content.translate(_ASCII_LOWER)
+    length = len(content)
+    segment_start = 0
+    scanned = 0
+    pos = folded.find(' need')
+    
+    while pos != -1:
+        # The item runs back to the previous clause delimiter (or the start)
+        delimiter = max(content.rfind('.', scanned, pos), content.rfind(',', scanned, pos))
+        if delimiter != -1:
+            segment_start = delimiter + 1
+        scanned = pos
+        
+        after = pos + 5
+        if folded.startswith(' ', after):
+            action_start = after + 1
+        elif folded.startswith('s ', after):
+            action_start = after + 2
+        else:
+            action_start = -1
+        
+        if segment_start < pos and action_start != -1:
+            # Optional "to " / "be " are skipped only if an action remains after them
+            candidates = []
+            if folded.startswith('to ', action_start):
+                if folded.startswith('be ', action_start + 3):
+                    candidates.append(action_start + 6)
+                candidates.append(action_start + 3)
+            if folded.startswith('be ', action_start):
+                candidates.append(action_start + 3)
+            candidates.append(action_start)
             
-        Returns:
-            str: Generated subject line
-        """
-        # Remove extra whitespace and newlines
-        content = ' '.join(content.split())
+            for start in candidates:
+                if start < length and content[start] not in '.,':
+                    ends = [i for i in (content.find('.', start), content.find(',', start)) if i != -1]
+                    end = min(ends) if ends else length
+                    return content[segment_start:pos], content[start:end]
         
-        # Try to extract key phrases
-        # Look for work items, tasks, or main topics
+        pos = folded.find(' need', pos + 1)
+    
+    return None
+
+
+def generate_subject_from_content(content: str, max_length: int = 100) -> str:
+    """
+    Generate a structured subject line from message content
+    
+    Extracts key information and creates a concise subject
+    
+    Args:
+        content (str): Message content
+        max_length (int): Maximum subject length
         
-        # Pattern 1: Look for "X need to be Y" patterns
-        work_patterns = re.findall(
-            r'([^.,]+?)\s+need(?:s)?\s+(?:to\s+)?(?:be\s+)?([^.,]+)',
-            content,
-            re.IGNORECASE
-        )
+    Returns:
+        str: Generated subject line
+    """
+    # Remove extra whitespace and newlines
+    content = _WHITESPACE_RE.sub(' ', content).strip()
+    
+    # Try to extract key phrases
+    # Look for work items, tasks, or main topics
+    
+    # Pattern 1: Look for "X need to be Y" patterns
+    # Only the first work item is used, so stop at the first match
+    # (plain string scan; the regex form backtracks on long text)
+    work_item = _find_work_item(content)
+    
+    if work_item:
+        item, action = work_item
+        subject = f"{item.strip()} - {action.strip()}"
+    else:
+        # Fallback: use first sentence or first 100 chars
+        # (only the first sentence is needed, so stop after one split)
+        first_sentence = _SENTENCE_SPLIT_RE.split(content, maxsplit=1)[0]
+        subject = first_sentence.strip() if first_sentence else content[:100]
+    
+    # Truncate if too long
+    if len(subject) > max_length:
+        subject = subject[:max_length].rsplit(' ', 1)[0] + '...'
+    
+    return subject
+
+
+def structure_email_body(content: str) -> str:
+    """
+    Structure email body from message content
+    
+    Organizes content into sections for better readability
+    
+    Args:
+        content (str): Raw message content
         
-        if work_patterns:
-            # Use first work item as subject
-            item, action = work_patterns[0]
-            subject = f"{item.strip()} - {action.strip()}"
+    Returns:
+        str: Structured email body
+    """
+    # Group related information
+    work_items = []
+    estimates = []
+    other_info = []
+    
+    for line in content.splitlines():
+        # Skip blank lines before paying for a stripped copy
+        if not line or line.isspace():
+            continue
+        line = line.strip()
+        line_lower = line.lower()
+        
+        # Detect work items (contain any of _WORK_KEYWORDS)
+        if _WORK_KEYWORDS_RE.search(line_lower):
+            work_items.append(line)
+        
+        # Detect estimates (contain any of _ESTIMATE_KEYWORDS)
+        elif _ESTIMATE_KEYWORDS_RE.search(line_lower):
+            estimates.append(line)
+        
+        # Other information
         else:
-            # Fallback: use first sentence or first 100 chars
-            sentences = re.split(r'[.!?]', content)
-            subject = sentences[0].strip() if sentences[0] else content[:100]
-        
-        # Truncate if too long
-        if len(subject) > max_length:
-            subject = subject[:max_length].rsplit(' ', 1)[0] + '...'
-        
-        return subject
+            other_info.append(line)
     
-    @staticmethod
-    def structure_email_body(content: str) -> str:
-        """
-        Structure email body from message content
-        
-        Organizes content into sections for better readability
-        
-        Args:
-            content (str): Raw message content
-            
-        Returns:
-            str: Structured email body
-        """
-        # Split by common delimiters
-        lines = content.split('\n')
-        
-        # Group related information
-        work_items = []
-        estimates = []
-        other_info = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Detect work items (contain "need", "require", "should")
-            if any(keyword in line.lower() for keyword in ['need', 'require', 'should', 'must']):
-                work_items.append(f"• {line}")
-            
-            # Detect estimates (contain "time", "cost", "price", "day", "hour", "euro", "$")
-            elif any(keyword in line.lower() for keyword in ['time', 'cost', 'price', 'day', 'hour', 'euro', '$', '€']):
-                estimates.append(f"• {line}")
-            
-            # Other information
-            else:
-                other_info.append(f"• {line}")
-        
-        # Build structured body
-        body_parts = []
-        
-        if work_items:
-            body_parts.append("**Work Items:**")
-            body_parts.extend(work_items)
-            body_parts.append("")
-        
-        if estimates:
-            body_parts.append("**Estimates:**")
-            body_parts.extend(estimates)
-            body_parts.append("")
-        
-        if other_info:
-            body_parts.append("**Additional Information:**")
-            body_parts.extend(other_info)
-        
-        body = "\n".join(body_parts)
-        
-        # If no structure detected, return original with formatting
-        if not body_parts or not body.strip():
-            body = content
+    # If no structure detected, return original with formatting
+    if not (work_items or estimates or other_info):
+        return content
+    
+    # Build structured body: bulleted sections separated by a blank line,
+    # assembled into one list and joined once
+    body_parts = []
+    
+    if work_items:
+        body_parts += ("**Work Items:**\n• ", "\n• ".join(work_items), "\n\n")
+    
+    if estimates:
+        body_parts += ("**Estimates:**\n• ", "\n• ".join(estimates), "\n\n")
+    
+    if other_info:
+        body_parts += ("**Additional Information:**\n• ", "\n• ".join(other_info))
+    else:
+        # Sections without a following "Additional Information" end in a single newline
+        body_parts[-1] = "\n"
+    
+    return "".join(body_parts)
+
+
+def _get_gmail_service(phone_number: str) -> Optional[Any]:
+    """
+    Return a Gmail service for the user, reusing a cached one when possible
+    
+    Args:
+        phone_number (str): User's phone number to look up credentials
         
-        return body
+    Returns:
+        Gmail service resource, or None if the user has no Google token
+    """
+    now = time.monotonic()
+    cached = _gmail_service_cache.get(phone_number)
+    if cached and cached[0] > now:
+        _, service, credentials = cached
+        if credentials.valid:
+            return service
+        if credentials.refresh_token:
+            # The service holds this credentials object, so refreshing it in place is enough
+            credentials.refresh(Request())
+            logger.info(f"Token refreshed for MailMe email send")
+            return service
+    
+    # Get user's Google token from database
+    token = get_google_user_token_by_phone(phone_number)
+    
+    if not token:
+        logger.error(f"No Google token found for user: {phone_number}")
+        _gmail_service_cache.pop(phone_number, None)
+        return None
+    
+    # Authenticate using token data directly
+    credentials = UserCredentials.from_authorized_user_info(token, GoogleEmailClient.SCOPES)
+    
+    # Refresh token if expired
+    if credentials.expired and credentials.refresh_token:
+        credentials.refresh(Request())
+        logger.info(f"Token refreshed for MailMe email send")
+    
+    # Build Gmail service from the bundled discovery document
+    service = googleapiclient.discovery.build(
+        'gmail', 'v1', credentials=credentials,
+        cache_discovery=False, static_discovery=True
+    )
+    _gmail_service_cache[phone_number] = (now + _GMAIL_SERVICE_TTL_SECONDS, service, credentials)
+    return service
+
+
+class MailMeHandler:
+    """
+    Handles "mail me" commands
+    Parses message content and creates structured emails
+    """
+    
+    # Pure text helpers live at module level; exposed here for existing callers
+    is_mail_me_command = staticmethod(is_mail_me_command)
+    extract_mail_me_content = staticmethod(extract_mail_me_content)
+    classify = staticmethod(classify)
+    generate_subject_from_content = staticmethod(generate_subject_from_content)
+    structure_email_body = staticmethod(structure_email_body)
     
     @staticmethod
     def create_mail_me_request(
@@ -262,10 +459,10 @@ class MailMeHandler:
         """
         try:
             # Generate subject from content
-            subject = MailMeHandler.generate_subject_from_content(content)
+            subject = generate_subject_from_content(content)
             
             # Structure email body
-            body = MailMeHandler.structure_email_body(content)
+            body = structure_email_body(content)
             
             # Create request
             request = MailMeRequest(
@@ -321,48 +518,16 @@ class MailMeHandler:
             bool: True if email sent successfully, False otherwise
         """
         try:
-            from .config_loader_v2 import get_google_user_token_by_phone
-            
-            # Get user's Google token from database
-            token = get_google_user_token_by_phone(phone_number)
-            
-            if not token:
-                logger.error(f"No Google token found for user: {phone_number}")
+            service = _get_gmail_service(phone_number)
+            if service is None:
                 return False
             
-            # Authenticate using token data directly
-            from google.oauth2.credentials import Credentials as UserCredentials
-            from google.auth.transport.requests import Request
-            import googleapiclient.discovery
-            import base64
-            from email.mime.text import MIMEText
-            
-            SCOPES = [
-                'https://www.googleapis.com/auth/gmail.readonly',
-                'https://www.googleapis.com/auth/gmail.send',
-                'https://www.googleapis.com/auth/gmail.modify'
-            ]
-            
-            credentials = UserCredentials.from_authorized_user_info(token, SCOPES)
-            
-            # Refresh token if expired
-            if credentials.expired and credentials.refresh_token:
-                request_obj = Request()
-                credentials.refresh(request_obj)
-                logger.info(f"Token refreshed for MailMe email send")
-            
-            # Build Gmail service
-            service = googleapiclient.discovery.build(
-                'gmail', 'v1', credentials=credentials
-            )
-            
-            # Create MIME message
-            message = MIMEText(mail_me_request.body)
-            message['to'] = mail_me_request.recipient_email
-            message['subject'] = mail_me_request.subject
-            
-            # Encode message
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            # Build and encode the message in one pass
+            raw_message = base64.urlsafe_b64encode(build_raw_message(
+                mail_me_request.recipient_email,
+                mail_me_request.subject,
+                mail_me_request.body
+            )).decode('ascii')
             send_message = {'raw': raw_message}
             
             logger.info(f"Attempting to send MailMe email to {mail_me_request.recipient_email}")
@@ -387,6 +552,8 @@ class MailMeHandler:
                 return False
             
         except Exception as e:
+            # Drop the cached service so the next attempt re-authenticates
+            _gmail_service_cache.pop(phone_number, None)
             logger.error(f"Error sending MailMe email: {str(e)}", exc_info=True)
             return False
 
@@ -6,20 +6,114 @@ File location: pareto_agents/memory_service.py
 """
 
 import os
+import asyncio
+import atexit
+import functools
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import operator
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from datetime import datetime, timezone
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 logger = logging.getLogger(__name__)
 
+# In-process cache for search results: repeated queries from the same user
+# skip the Mem0 round-trip. Entries expire after the TTL and a user's entries
+# are dropped whenever their memories change.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL_SECONDS = 300
+
+# Messages too short or generic to give a useful memory search are answered
+# without the Mem0 round-trip
+MIN_CONTEXT_QUERY_LENGTH = 4
+_NON_INFORMATIVE_MESSAGES = frozenset({
+    "ok", "okay", "yes", "yeah", "yep", "no", "nope", "sure", "thanks",
+    "thank you", "thx", "ty", "great", "cool", "nice", "perfect", "got it",
+})
+
 # Check if mem0ai is available
 try:
-    from mem0 import MemoryClient
+    import httpx
+    from mem0 import MemoryClient, AsyncMemoryClient
+    from mem0.exceptions import NetworkError, RateLimitError
     MEM0_AVAILABLE = True
 except ImportError:
     MEM0_AVAILABLE = False
     logger.warning("mem0ai package not installed. Memory features will be disabled.")
 
+# HTTP/2 lets concurrent add/search calls share one TLS connection; it needs
+# the optional h2 package, otherwise the pooled clients fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool settings shared by the sync and async Mem0 HTTP clients
+MEM0_MAX_KEEPALIVE_CONNECTIONS = 32
+MEM0_MAX_CONNECTIONS = 64
+MEM0_TIMEOUT_SECONDS = 10.0
+MEM0_CONNECT_TIMEOUT_SECONDS = 2.0
+
+# Memory writes run on a background pool so the request thread never waits
+# for Mem0; writes for the same user are applied in the order they were queued
+MEMORY_WRITE_WORKERS = 8
+MEMORY_WRITE_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+_memory_write_executor = ThreadPoolExecutor(max_workers=MEMORY_WRITE_WORKERS, thread_name_prefix="mem0-write")
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Return True for Mem0 rate limiting and transient network/gateway errors"""
+    return MEM0_AVAILABLE and isinstance(exc, (RateLimitError, NetworkError))
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_exponential_jitter(multiplier=0.5, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+def _add_with_retry(client: "MemoryClient", **kwargs) -> Dict:
+    """Call client.add, retrying 429s and transient errors with exponential backoff and jitter"""
+    return client.add(**kwargs)
+
+
+# Static metadata attached to every stored memory
+_BASE_META = {"source": "pareto_agent"}
+_BASE_META_SINGLE = {"source": "pareto_agent", "type": "explicit_memory"}
+_ROLE_USER = "user"
+_ROLE_ASSISTANT = "assistant"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string with second precision."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+# Deletes every ASCII character except digits and '+' in one C-level pass
+_PHONE_DELETE_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == '+')
+))
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_phone_number(phone_number: str) -> str:
+    """Keep only digits and '+' from a phone number."""
+    if phone_number.isascii():
+        return phone_number.translate(_PHONE_DELETE_TABLE)
+    # str.isdigit also accepts non-ASCII digits, which the table doesn't cover
+    return ''.join(c for c in phone_number if c.isdigit() or c == '+')
+
 
 class MemoryService:
     """
@@ -38,6 +132,20 @@ class MemoryService:
         self.enabled = False
         self.org_id = os.environ.get('MEM0_ORG_ID')
         self.project_id = os.environ.get('MEM0_PROJECT_ID')
+        self._search_cache: "OrderedDict[Tuple, Tuple[float, Tuple[Dict, ...]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        # Per event loop: cache key -> in-flight search future (see search_memories_async)
+        self._inflight_searches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        # AsyncMemoryClient wraps an httpx.AsyncClient, which is bound to the
+        # event loop it is used on, so one is created per loop on first use
+        self._client_kwargs: Dict[str, Any] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMemoryClient]" = weakref.WeakKeyDictionary()
+        # Per user: queued (write, token) pairs, drained by one pool worker at a time
+        self._write_queues: Dict[str, deque] = {}
+        self._pending_writes: set = set()
+        self._write_lock = threading.Lock()
+        # Per endpoint ("search", "get_all"): extractor matching the response shape Mem0 returns
+        self._result_extractors: Dict[str, Callable[[Any], List[Dict]]] = {}
         
         if not MEM0_AVAILABLE:
             logger.warning("Memory service disabled: mem0ai package not installed")
@@ -57,18 +165,20 @@ class MemoryService:
             # Both are optional for basic usage, but recommended for organization
             if self.org_id:
                 client_kwargs["org_id"] = self.org_id
-                logger.info(f"Using Mem0 org_id: {self.org_id[:20]}...")
+                logger.info("Using Mem0 org_id: %s...", self.org_id[:20])
             if self.project_id:
                 client_kwargs["project_id"] = self.project_id
-                logger.info(f"Using Mem0 project_id: {self.project_id[:20]}...")
+                logger.info("Using Mem0 project_id: %s...", self.project_id[:20])
             
-            self.client = MemoryClient(**client_kwargs)
+            # Keep TLS connections to the Mem0 API alive between calls
+            self.client = MemoryClient(client=httpx.Client(**self._http_client_options()), **client_kwargs)
+            self._client_kwargs = client_kwargs
             self.enabled = True
             logger.info("✅ Memory service initialized successfully")
             
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"❌ Failed to initialize memory service: {error_msg}")
+            logger.error("❌ Failed to initialize memory service: %s", error_msg)
             
             # Provide helpful guidance for common errors
             if "org_id" in error_msg.lower() or "project_id" in error_msg.lower():
@@ -82,8 +192,198 @@ class MemoryService:
         Removes special characters and ensures consistency.
         """
         # Remove spaces, dashes, and other special characters
-        normalized = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-        return normalized
+        return _normalize_phone_number(phone_number)
+    
+    @staticmethod
+    def _search_cache_key(user_id: str, query: str, top_k: int, threshold: float) -> Tuple:
+        """Build the search cache key; the query is compared case- and whitespace-insensitively."""
+        return (user_id, ' '.join(query.lower().split()), top_k, threshold)
+    
+    def _get_cached_search(self, key: Tuple) -> Optional[List[Dict]]:
+        """Return cached search results for key, or None on a miss or expired entry."""
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, memories = entry
+            if expires_at <= time.monotonic():
+                del self._search_cache[key]
+                return None
+            self._search_cache.move_to_end(key)
+            return list(memories)
+    
+    def _store_cached_search(self, key: Tuple, memories: List[Dict]) -> None:
+        """Cache search results for key, evicting the least recently used entries."""
+        with self._search_cache_lock:
+            self._search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, tuple(memories))
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+    
+    def _invalidate_search_cache(self, user_id: Optional[str] = None) -> None:
+        """Drop cached searches for user_id, or for everyone if user_id is None."""
+        with self._search_cache_lock:
+            if user_id is None:
+                self._search_cache.clear()
+                return
+            for key in [key for key in self._search_cache if key[0] == user_id]:
+                del self._search_cache[key]
+    
+    def _submit_write(self, user_id: str, write) -> Future:
+        """
+        Queue a memory write for background execution.
+        
+        Writes for the same user run one after another in submission order;
+        writes for different users run concurrently on the write pool.
+        
+        Args:
+            user_id: Normalized user ID the write belongs to
+            write: Callable performing the write
+            
+        Returns:
+            Future resolved with the write's result
+        """
+        token = Future()
+        with self._write_lock:
+            queue = self._write_queues.get(user_id)
+            start_drain = queue is None
+            if start_drain:
+                queue = self._write_queues[user_id] = deque()
+            queue.append((write, token))
+            self._pending_writes.add(token)
+        
+        if start_drain:
+            _memory_write_executor.submit(self._drain_writes, user_id)
+        return token
+    
+    def _drain_writes(self, user_id: str) -> None:
+        """Run queued writes for a user until their queue is empty."""
+        while True:
+            with self._write_lock:
+                queue = self._write_queues[user_id]
+                if not queue:
+                    del self._write_queues[user_id]
+                    return
+                write, token = queue.popleft()
+            
+            try:
+                token.set_result(write())
+            except Exception as e:
+                token.set_exception(e)
+            finally:
+                with self._write_lock:
+                    self._pending_writes.discard(token)
+    
+    def wait_for_pending_writes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until queued memory writes have finished.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if every queued write finished within the timeout
+        """
+        with self._write_lock:
+            pending = list(self._pending_writes)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+    
+    def _store_memory(self, user_id: str, messages: List[Dict[str, str]], mem_metadata: Dict[str, Any], label: str) -> Optional[Dict]:
+        """Write memory to Mem0 (runs on the write pool)."""
+        try:
+            result = _add_with_retry(
+                self.client,
+                messages=messages,
+                user_id=user_id,
+                metadata=mem_metadata,
+                version="v2"
+            )
+            
+            logger.info("✅ %s stored for user %s...", label, user_id[:8])
+            logger.debug("Memory result: %s", result)
+            return result
+            
+        except Exception as e:
+            logger.error("❌ Failed to store %s: %s", label.lower(), e)
+            return None
+        
+        finally:
+            # Searches made while the write was in flight may have cached stale results
+            self._invalidate_search_cache(user_id)
+    
+    @staticmethod
+    def _http_client_options() -> Dict[str, Any]:
+        """Pooling, keep-alive and timeout options for the Mem0 httpx clients."""
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_keepalive_connections=MEM0_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=MEM0_MAX_CONNECTIONS,
+            ),
+            "timeout": httpx.Timeout(MEM0_TIMEOUT_SECONDS, connect=MEM0_CONNECT_TIMEOUT_SECONDS),
+        }
+    
+    async def _get_async_client(self) -> "AsyncMemoryClient":
+        """Return the AsyncMemoryClient for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # The constructor validates the API key with a blocking request
+            client = await loop.run_in_executor(
+                None,
+                lambda: AsyncMemoryClient(
+                    client=httpx.AsyncClient(**self._http_client_options()), **self._client_kwargs
+                ),
+            )
+            self._async_clients[loop] = client
+        return client
+    
+    def _extract_memories(self, endpoint: str, results: Any) -> List[Dict]:
+        """
+        Extract the memory list from a Mem0 response.
+        
+        The response shape (list, or dict with 'results') is stable per
+        endpoint, so it is probed once and the matching extractor reused.
+        """
+        extractor = self._result_extractors.get(endpoint)
+        if extractor is not None:
+            try:
+                return extractor(results)
+            except (KeyError, TypeError):
+                pass
+        
+        # Handle both list and dict response formats
+        if isinstance(results, dict) and 'results' in results:
+            self._result_extractors[endpoint] = operator.itemgetter('results')
+            return results['results']
+        elif isinstance(results, list):
+            self._result_extractors[endpoint] = _identity
+            return results
+        return []
+    
+    @staticmethod
+    def _conversation_payload(
+        user_message: str,
+        assistant_response: str,
+        phone_number: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Build the messages and metadata stored for a conversation exchange."""
+        messages = [
+            {"role": _ROLE_USER, "content": user_message},
+            {"role": _ROLE_ASSISTANT, "content": assistant_response}
+        ]
+        
+        # Build metadata in one dict; caller-supplied keys override the defaults
+        mem_metadata = {
+            **_BASE_META,
+            "timestamp": _utc_timestamp(),
+            "phone_number": phone_number,
+            **(metadata or {})
+        }
+        
+        return messages, mem_metadata
     
     def add_memory(
         self,
@@ -91,10 +391,13 @@ class MemoryService:
         assistant_response: str,
         phone_number: str,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Optional[Dict]:
+    ) -> Optional[Future]:
         """
         Store a conversation exchange as memory.
         
+        The write is queued and performed in the background; this returns
+        immediately.
+        
         Args:
             user_message: The user's message
             assistant_response: The assistant's response
@@ -102,7 +405,8 @@ class MemoryService:
             metadata: Optional additional metadata
             
         Returns:
-            Memory creation result or None if failed
+            Future resolving to the memory creation result (None if the
+            write failed), or None if the memory service is disabled
         """
         if not self.enabled:
             logger.debug("Memory service not enabled, skipping add_memory")
@@ -110,35 +414,62 @@ class MemoryService:
         
         try:
             user_id = self._normalize_user_id(phone_number)
+            messages, mem_metadata = self._conversation_payload(
+                user_message, assistant_response, phone_number, metadata
+            )
             
-            messages = [
-                {"role": "user", "content": user_message},
-                {"role": "assistant", "content": assistant_response}
-            ]
+            # Queue the write to Mem0
+            self._invalidate_search_cache(user_id)
+            return self._submit_write(
+                user_id, lambda: self._store_memory(user_id, messages, mem_metadata, "Memory")
+            )
             
-            # Build metadata
-            mem_metadata = {
-                "source": "pareto_agent",
-                "timestamp": datetime.utcnow().isoformat(),
-                "phone_number": phone_number
-            }
-            if metadata:
-                mem_metadata.update(metadata)
-            
-            # Add memory to Mem0
-            result = self.client.add(
+        except Exception as e:
+            logger.error("❌ Failed to queue memory: %s", e)
+            return None
+    
+    async def add_memory_async(
+        self,
+        user_message: str,
+        assistant_response: str,
+        phone_number: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
+        """
+        Async variant of add_memory using AsyncMemoryClient.
+        
+        Args:
+            user_message: The user's message
+            assistant_response: The assistant's response
+            phone_number: User's phone number (used as user_id)
+            metadata: Optional additional metadata
+            
+        Returns:
+            Memory creation result or None if failed
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            user_id = self._normalize_user_id(phone_number)
+            messages, mem_metadata = self._conversation_payload(
+                user_message, assistant_response, phone_number, metadata
+            )
+            
+            client = await self._get_async_client()
+            self._invalidate_search_cache(user_id)
+            result = await client.add(
                 messages=messages,
                 user_id=user_id,
                 metadata=mem_metadata,
                 version="v2"
             )
             
-            logger.info(f"✅ Memory stored for user {user_id[:8]}...")
-            logger.debug(f"Memory result: {result}")
+            logger.info("✅ Memory stored for user %s...", user_id[:8])
             return result
             
         except Exception as e:
-            logger.error(f"❌ Failed to store memory: {e}")
+            logger.error("❌ Failed to store memory: %s", e)
             return None
     
     def add_single_memory(
@@ -146,17 +477,21 @@ class MemoryService:
         content: str,
         phone_number: str,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Optional[Dict]:
+    ) -> Optional[Future]:
         """
         Store a single piece of information as memory.
         
+        The write is queued and performed in the background; this returns
+        immediately.
+        
         Args:
             content: The information to remember
             phone_number: User's phone number (used as user_id)
             metadata: Optional additional metadata
             
         Returns:
-            Memory creation result or None if failed
+            Future resolving to the memory creation result (None if the
+            write failed), or None if the memory service is disabled
         """
         if not self.enabled:
             return None
@@ -165,29 +500,18 @@ class MemoryService:
             user_id = self._normalize_user_id(phone_number)
             
             messages = [
-                {"role": "user", "content": content}
+                {"role": _ROLE_USER, "content": content}
             ]
             
-            mem_metadata = {
-                "source": "pareto_agent",
-                "timestamp": datetime.utcnow().isoformat(),
-                "type": "explicit_memory"
-            }
-            if metadata:
-                mem_metadata.update(metadata)
+            mem_metadata = {**_BASE_META_SINGLE, "timestamp": _utc_timestamp(), **(metadata or {})}
             
-            result = self.client.add(
-                messages=messages,
-                user_id=user_id,
-                metadata=mem_metadata,
-                version="v2"
+            self._invalidate_search_cache(user_id)
+            return self._submit_write(
+                user_id, lambda: self._store_memory(user_id, messages, mem_metadata, "Single memory")
             )
             
-            logger.info(f"✅ Single memory stored for user {user_id[:8]}...")
-            return result
-            
         except Exception as e:
-            logger.error(f"❌ Failed to store single memory: {e}")
+            logger.error("❌ Failed to queue single memory: %s", e)
             return None
     
     def search_memories(
@@ -216,6 +540,12 @@ class MemoryService:
         try:
             user_id = self._normalize_user_id(phone_number)
             
+            cache_key = self._search_cache_key(user_id, query, top_k, threshold)
+            cached = self._get_cached_search(cache_key)
+            if cached is not None:
+                logger.info("🔍 Using %d cached memories for user %s...", len(cached), user_id[:8])
+                return cached
+            
             results = self.client.search(
                 query=query,
                 filters={"user_id": user_id},
@@ -224,25 +554,96 @@ class MemoryService:
                 threshold=threshold
             )
             
-            # Handle both list and dict response formats
-            if isinstance(results, dict) and 'results' in results:
-                memories = results['results']
-            elif isinstance(results, list):
-                memories = results
-            else:
-                memories = []
+            memories = self._extract_memories("search", results)
             
-            logger.info(f"🔍 Found {len(memories)} relevant memories for user {user_id[:8]}...")
+            self._store_cached_search(cache_key, memories)
+            logger.info("🔍 Found %d relevant memories for user %s...", len(memories), user_id[:8])
             
             # Log memory content for debugging (truncated)
-            for i, mem in enumerate(memories[:3]):
-                mem_text = mem.get('memory', mem.get('text', str(mem)))[:100]
-                logger.debug(f"  Memory {i+1}: {mem_text}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, mem in enumerate(memories[:3]):
+                    mem_text = mem.get('memory', mem.get('text', str(mem)))[:100]
+                    logger.debug("  Memory %d: %s...", i + 1, mem_text)
+            
+            return memories
+            
+        except Exception as e:
+            logger.error("❌ Failed to search memories: %s", e)
+            return []
+    
+    async def search_memories_async(
+        self,
+        query: str,
+        phone_number: str,
+        top_k: int = 5,
+        threshold: float = 0.3
+    ) -> List[Dict]:
+        """
+        Async variant of search_memories using AsyncMemoryClient; coalesces
+        concurrent identical searches.
+        
+        While a search for the same user/query/top_k/threshold is in flight on
+        this event loop, later callers await that request instead of issuing
+        their own Mem0 call. The search never blocks the event loop.
+        
+        Args:
+            query: The search query
+            phone_number: User's phone number to filter memories
+            top_k: Maximum number of results to return
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            List of relevant memories
+        """
+        if not self.enabled:
+            return []
+        
+        user_id = self._normalize_user_id(phone_number)
+        cache_key = self._search_cache_key(user_id, query, top_k, threshold)
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight_searches.setdefault(loop, {})
+        pending = inflight.get(cache_key)
+        if pending is not None:
+            logger.debug("🔍 Joining in-flight memory search for user %s...", user_id[:8])
+            return list(await asyncio.shield(pending))
+        
+        future = asyncio.ensure_future(self._search_remote_async(cache_key, query, user_id, top_k, threshold))
+        inflight[cache_key] = future
+        try:
+            return list(await asyncio.shield(future))
+        finally:
+            inflight.pop(cache_key, None)
+    
+    async def _search_remote_async(
+        self,
+        cache_key: Tuple,
+        query: str,
+        user_id: str,
+        top_k: int,
+        threshold: float
+    ) -> List[Dict]:
+        """Run a Mem0 search with AsyncMemoryClient and cache the result."""
+        try:
+            client = await self._get_async_client()
+            results = await client.search(
+                query=query,
+                filters={"user_id": user_id},
+                version="v2",
+                top_k=top_k,
+                threshold=threshold
+            )
+            memories = self._extract_memories("search", results)
             
+            self._store_cached_search(cache_key, memories)
+            logger.info("🔍 Found %d relevant memories for user %s...", len(memories), user_id[:8])
             return memories
             
         except Exception as e:
-            logger.error(f"❌ Failed to search memories: {e}")
+            logger.error("❌ Failed to search memories: %s", e)
             return []
     
     def get_all_memories(
@@ -275,18 +676,13 @@ class MemoryService:
                 page_size=page_size
             )
             
-            if isinstance(results, dict) and 'results' in results:
-                memories = results['results']
-            elif isinstance(results, list):
-                memories = results
-            else:
-                memories = []
+            memories = self._extract_memories("get_all", results)
             
-            logger.info(f"📋 Retrieved {len(memories)} memories for user {user_id[:8]}...")
+            logger.info("📋 Retrieved %d memories for user %s...", len(memories), user_id[:8])
             return memories
             
         except Exception as e:
-            logger.error(f"❌ Failed to get memories: {e}")
+            logger.error("❌ Failed to get memories: %s", e)
             return []
     
     def get_context_for_message(
@@ -307,7 +703,7 @@ class MemoryService:
         Returns:
             Formatted context string
         """
-        if not self.enabled:
+        if not self.enabled or not self._is_informative_query(message):
             return ""
         
         memories = self.search_memories(
@@ -317,18 +713,56 @@ class MemoryService:
             threshold=0.25
         )
         
+        return self._format_memory_context(memories)
+    
+    async def get_context_for_message_async(
+        self,
+        message: str,
+        phone_number: str,
+        max_memories: int = 3
+    ) -> str:
+        """
+        Async variant of get_context_for_message.
+        
+        Args:
+            message: The incoming user message
+            phone_number: User's phone number
+            max_memories: Maximum number of memories to include
+            
+        Returns:
+            Formatted context string
+        """
+        if not self.enabled or not self._is_informative_query(message):
+            return ""
+        
+        memories = await self.search_memories_async(
+            query=message,
+            phone_number=phone_number,
+            top_k=max_memories,
+            threshold=0.25
+        )
+        return self._format_memory_context(memories)
+    
+    @staticmethod
+    def _is_informative_query(message: str) -> bool:
+        """Return False for empty, very short, slash-command or acknowledgement messages."""
+        text = message.strip() if message else ""
+        if len(text) < MIN_CONTEXT_QUERY_LENGTH or text.startswith('/'):
+            return False
+        return text.rstrip('.!?').lower() not in _NON_INFORMATIVE_MESSAGES
+    
+    @staticmethod
+    def _format_memory_context(memories: List[Dict]) -> str:
+        """Format search results as the context block included in the agent prompt."""
         if not memories:
             return ""
         
         # Format memories as context
-        context_parts = ["📝 **Relevant memories about this user:**"]
-        for i, mem in enumerate(memories, 1):
-            memory_text = mem.get('memory', '')
-            if memory_text:
-                context_parts.append(f"  {i}. {memory_text}")
-        
-        context = "\n".join(context_parts)
-        logger.debug(f"Memory context: {context}")
+        context = "\n".join((
+            "📝 **Relevant memories about this user:**",
+            *(f"  {i}. {mem['memory']}" for i, mem in enumerate(memories, 1) if mem.get('memory')),
+        ))
+        logger.debug("Memory context: %s", context)
         return context
     
     def delete_memory(self, memory_id: str) -> bool:
@@ -346,10 +780,12 @@ class MemoryService:
         
         try:
             self.client.delete(memory_id)
-            logger.info(f"🗑️ Memory {memory_id} deleted")
+            # The owning user is unknown here, so drop every cached search
+            self._invalidate_search_cache()
+            logger.info("🗑️ Memory %s deleted", memory_id)
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to delete memory: {e}")
+            logger.error("❌ Failed to delete memory: %s", e)
             return False
     
     def delete_all_user_memories(self, phone_number: str) -> bool:
@@ -368,25 +804,29 @@ class MemoryService:
         try:
             user_id = self._normalize_user_id(phone_number)
             self.client.delete_all(filters={"user_id": user_id})
-            logger.info(f"🗑️ All memories deleted for user {user_id[:8]}...")
+            self._invalidate_search_cache(user_id)
+            logger.info("🗑️ All memories deleted for user %s...", user_id[:8])
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to delete user memories: {e}")
+            logger.error("❌ Failed to delete user memories: %s", e)
             return False
 
 
 # Global instance for easy access
 _memory_service: Optional[MemoryService] = None
+_memory_service_lock = threading.Lock()
 
 
 def get_memory_service() -> MemoryService:
     """
     Get the global memory service instance.
-    Creates one if it doesn't exist.
+    Creates one if it doesn't exist; safe to call from several threads.
     """
     global _memory_service
     if _memory_service is None:
-        _memory_service = MemoryService()
+        with _memory_service_lock:
+            if _memory_service is None:
+                _memory_service = MemoryService()
     return _memory_service
 
 
@@ -395,9 +835,9 @@ def add_conversation_memory(
     assistant_response: str,
     phone_number: str,
     metadata: Optional[Dict] = None
-) -> Optional[Dict]:
+) -> Optional[Future]:
     """
-    Convenience function to add a conversation memory.
+    Convenience function to add a conversation memory (queued in the background).
     """
     service = get_memory_service()
     return service.add_memory(user_message, assistant_response, phone_number, metadata)
@@ -411,9 +851,47 @@ def get_memory_context(message: str, phone_number: str) -> str:
     return service.get_context_for_message(message, phone_number)
 
 
+async def add_conversation_memory_async(
+    user_message: str,
+    assistant_response: str,
+    phone_number: str,
+    metadata: Optional[Dict] = None
+) -> Optional[Dict]:
+    """
+    Convenience function to add a conversation memory from async code.
+    """
+    service = get_memory_service()
+    return await service.add_memory_async(user_message, assistant_response, phone_number, metadata)
+
+
+async def get_memory_context_async(message: str, phone_number: str) -> str:
+    """
+    Convenience function to get memory context for a message from async code.
+    """
+    service = get_memory_service()
+    return await service.get_context_for_message_async(message, phone_number)
+
+
 def search_user_memories(query: str, phone_number: str, top_k: int = 5) -> List[Dict]:
     """
     Convenience function to search user memories.
     """
     service = get_memory_service()
     return service.search_memories(query, phone_number, top_k)
+
+
+def shutdown_memory_writes(timeout: float = MEMORY_WRITE_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+    """
+    Give queued memory writes up to `timeout` seconds to finish, then stop the write pool.
+    """
+    if _memory_service is not None and not _memory_service.wait_for_pending_writes(timeout):
+        logger.warning("⚠️ Memory write queue not fully drained before shutdown")
+    _memory_write_executor.shutdown(wait=False)
+
+
+atexit.register(shutdown_memory_writes)
+
+# Warm start: create the client (API key check, connection pool) at import so
+# the first user message doesn't pay for it
+if MEM0_AVAILABLE and os.environ.get('MEM0_API_KEY'):
+    get_memory_service()
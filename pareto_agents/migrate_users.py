@@ -15,9 +15,12 @@ import json
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from .database import (
     get_db_manager, get_db_session, 
     Administrator, Tenant, User, AuditLog,
@@ -26,6 +29,80 @@ from .database import (
 
 logger = logging.getLogger(__name__)
 
+# ijson streams the users array so large files never sit in memory whole;
+# without it the file is parsed with json.load
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# orjson parses the whole file much faster than stdlib json when not streaming
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Import bcrypt for password hashing
+try:
+    from bcrypt import hashpw, gensalt
+    BCRYPT_AVAILABLE = True
+except ImportError:
+    BCRYPT_AVAILABLE = False
+
+# Rows sent per multi-row INSERT while streaming users
+BATCH_SIZE = 500
+
+# Users listed by verify_migration
+VERIFY_SAMPLE_SIZE = 10
+
+# Dialect INSERT constructs supporting ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+
+def build_user_row(
+    tenant_id: int,
+    user_data,
+    default_first_name: str = '',
+    default_last_name: str = ''
+) -> Optional[Dict]:
+    """
+    Validate a JSON user entry and convert it to a users table row
+    
+    Invalid entries are skipped here so that one bad user can't make
+    the batch INSERT fail and roll back the whole migration.
+    
+    Args:
+        tenant_id: Tenant the user belongs to
+        user_data: User entry from the JSON file
+        default_first_name: Used when the first name is missing or null
+        default_last_name: Used when the last name is missing or null
+        
+    Returns:
+        Column-value dict, or None if the entry is invalid
+    """
+    if not isinstance(user_data, dict):
+        logger.error("❌ Invalid user entry (skipping): %r", user_data)
+        return None
+    
+    phone_number = user_data.get('phone_number')
+    if not isinstance(phone_number, str) or not phone_number.strip():
+        logger.error("❌ User without phone number (skipping): %s %s", user_data.get('first_name'), user_data.get('last_name'))
+        return None
+    
+    return {
+        'tenant_id': tenant_id,
+        'phone_number': phone_number.strip(),
+        'first_name': user_data.get('first_name') or default_first_name,
+        'last_name': user_data.get('last_name') or default_last_name,
+        'email': user_data.get('email'),
+        'is_enabled': bool(user_data.get('enabled', True)),
+    }
+
 
 class UserMigrator:
     """Handles migration of users from JSON to SQLite database"""
@@ -39,6 +116,7 @@ class UserMigrator:
         """
         self.json_path = json_path
         self.users_data: Optional[Dict] = None
+        self.json_loaded = False
         self.db_manager = get_db_manager()
     
     def load_json(self) -> bool:
@@ -50,22 +128,47 @@ class UserMigrator:
         """
         try:
             if not os.path.exists(self.json_path):
-                logger.error(f"❌ File not found: {self.json_path}")
+                logger.error("❌ File not found: %s", self.json_path)
                 return False
             
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                self.users_data = json.load(f)
+            if IJSON_AVAILABLE:
+                # Users are streamed from the file by iter_users()
+                self.json_loaded = True
+                logger.info("✅ Streaming users from %s", self.json_path)
+                return True
+            
+            if ORJSON_AVAILABLE:
+                # orjson is always UTF-8 and parses bytes directly
+                self.users_data = orjson.loads(Path(self.json_path).read_bytes())
+            else:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    self.users_data = json.load(f)
             
-            logger.info(f"✅ Loaded {len(self.users_data.get('users', []))} users from {self.json_path}")
+            self.json_loaded = True
+            logger.info("✅ Loaded %d users from %s", len(self.users_data.get('users', [])), self.json_path)
             return True
         
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Invalid JSON in {self.json_path}: {e}")
+            logger.error("❌ Invalid JSON in %s: %s", self.json_path, e)
             return False
         except Exception as e:
-            logger.error(f"❌ Error loading JSON: {e}")
+            logger.error("❌ Error loading JSON: %s", e)
             return False
     
+    def iter_users(self) -> Iterator[Dict]:
+        """
+        Iterate over the users in the JSON file
+        
+        Yields:
+            User dicts, streamed from disk when ijson is installed
+        """
+        if self.users_data is not None:
+            yield from self.users_data.get('users', [])
+            return
+        
+        with open(self.json_path, 'rb') as f:
+            yield from ijson.items(f, 'users.item')
+    
     def create_default_admin(self, session) -> Optional[Administrator]:
         """
         Create default admin user if not exists
@@ -80,14 +183,15 @@ class UserMigrator:
             # Check if admin already exists
             existing_admin = session.query(Administrator).filter_by(username='admin').first()
             if existing_admin:
-                logger.info(f"✅ Default admin already exists: {existing_admin.username}")
+                logger.info("✅ Default admin already exists: %s", existing_admin.username)
                 return existing_admin
             
-            # Import bcrypt for password hashing
-            try:
-                from bcrypt import hashpw, gensalt
+            # End the read transaction so no locks are held while bcrypt runs
+            session.commit()
+            
+            if BCRYPT_AVAILABLE:
                 password_hash = hashpw(b'admin123', gensalt()).decode('utf-8')
-            except ImportError:
+            else:
                 logger.warning("⚠️  bcrypt not installed, using plain password (NOT SECURE!)")
                 password_hash = 'admin123'
             
@@ -102,7 +206,7 @@ class UserMigrator:
             session.add(admin)
             session.commit()
             
-            logger.info(f"✅ Created default admin user: {admin.username}")
+            logger.info("✅ Created default admin user: %s", admin.username)
             logger.warning("⚠️  DEFAULT CREDENTIALS - CHANGE IMMEDIATELY IN PRODUCTION!")
             logger.warning("   Username: admin")
             logger.warning("   Password: admin123")
@@ -110,7 +214,7 @@ class UserMigrator:
             return admin
         
         except Exception as e:
-            logger.error(f"❌ Error creating default admin: {e}")
+            logger.error("❌ Error creating default admin: %s", e)
             session.rollback()
             return None
     
@@ -129,7 +233,7 @@ class UserMigrator:
             # Check if tenant already exists
             existing_tenant = session.query(Tenant).filter_by(company_slug='avoccado-tech').first()
             if existing_tenant:
-                logger.info(f"✅ Default tenant already exists: {existing_tenant.company_name}")
+                logger.info("✅ Default tenant already exists: %s", existing_tenant.company_name)
                 return existing_tenant
             
             tenant = Tenant(
@@ -144,11 +248,11 @@ class UserMigrator:
             session.add(tenant)
             session.commit()
             
-            logger.info(f"✅ Created default tenant: {tenant.company_name}")
+            logger.info("✅ Created default tenant: %s", tenant.company_name)
             return tenant
         
         except Exception as e:
-            logger.error(f"❌ Error creating default tenant: {e}")
+            logger.error("❌ Error creating default tenant: %s", e)
             session.rollback()
             return None
     
@@ -163,59 +267,80 @@ class UserMigrator:
         Returns:
             Number of users migrated
         """
-        if not self.users_data:
+        if not self.json_loaded:
             logger.error("❌ No users data loaded")
             return 0
         
         migrated_count = 0
-        users_list = self.users_data.get('users', [])
+        batch: List[Dict] = []
         
-        for user_data in users_list:
-            try:
-                phone_number = user_data.get('phone_number')
-                
-                # Check if user already exists
-                existing_user = session.query(User).filter_by(
-                    tenant_id=tenant.id,
-                    phone_number=phone_number
-                ).first()
-                
-                if existing_user:
-                    logger.info(f"⚠️  User already exists: {phone_number} (skipping)")
+        try:
+            for user_data in self.iter_users():
+                row = build_user_row(tenant.id, user_data)
+                if row is None:
                     continue
+                batch.append(row)
                 
-                # Create new user
-                user = User(
-                    tenant_id=tenant.id,
-                    phone_number=phone_number,
-                    first_name=user_data.get('first_name', ''),
-                    last_name=user_data.get('last_name', ''),
-                    email=user_data.get('email'),
-                    is_enabled=user_data.get('enabled', True),
-                    google_token_path=user_data.get('google_token_path')
-                )
-                
-                session.add(user)
-                migrated_count += 1
-                
-                logger.info(f"✅ Migrated user: {user.full_name} ({phone_number})")
+                if len(batch) >= BATCH_SIZE:
+                    migrated_count += self._insert_batch(session, batch)
+                    batch.clear()
             
-            except Exception as e:
-                logger.error(f"❌ Error migrating user {user_data.get('phone_number')}: {e}")
-                session.rollback()
-                continue
-        
-        # Commit all users at once
-        try:
+            if batch:
+                migrated_count += self._insert_batch(session, batch)
+            
+            # Commit all users at once
             session.commit()
-            logger.info(f"✅ Successfully migrated {migrated_count} users")
         except Exception as e:
-            logger.error(f"❌ Error committing users: {e}")
+            logger.error("❌ Error inserting users: %s", e)
             session.rollback()
             return 0
         
+        logger.info("✅ Successfully migrated %d users", migrated_count)
+        
         return migrated_count
     
+    def _insert_batch(self, session, rows: List[Dict]) -> int:
+        """
+        Insert user rows with a single multi-row INSERT ... ON CONFLICT DO NOTHING
+        
+        Users that already exist for the tenant (including duplicates within
+        the batch) are skipped by the database's (tenant_id, phone_number)
+        unique constraint.
+        
+        Args:
+            session: SQLAlchemy session
+            rows: Column-value dicts for the users table
+            
+        Returns:
+            Number of users inserted
+        """
+        dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if dialect_insert is None:
+            # No ON CONFLICT support: plain insert, duplicates fail the migration
+            session.execute(User.__table__.insert(), rows)
+            inserted = {row['phone_number'] for row in rows}
+        else:
+            stmt = (
+                dialect_insert(User.__table__)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=['tenant_id', 'phone_number'])
+                .returning(User.__table__.c.phone_number)
+            )
+            inserted = {phone for (phone,) in session.execute(stmt)}
+        inserted_count = len(inserted)
+        
+        for row in rows:
+            phone_number = row['phone_number']
+            if phone_number in inserted:
+                full_name = f"{row['first_name']} {row['last_name']}".strip()
+                logger.info("✅ Migrated user: %s (%s)", full_name, phone_number)
+                # Later duplicates of the same number in this batch were skipped
+                inserted.discard(phone_number)
+            else:
+                logger.info("⚠️  User already exists: %s (skipping)", phone_number)
+        
+        return inserted_count
+    
     def run_migration(self, dry_run: bool = False) -> bool:
         """
         Run complete migration process
@@ -253,10 +378,11 @@ class UserMigrator:
             # Migrate users
             if dry_run:
                 logger.info("🔍 DRY RUN MODE - No changes will be made")
-                users_list = self.users_data.get('users', [])
-                logger.info(f"Would migrate {len(users_list)} users")
-                for user_data in users_list:
-                    logger.info(f"  - {user_data.get('first_name')} {user_data.get('last_name')} ({user_data.get('phone_number')})")
+                user_count = 0
+                for user_data in self.iter_users():
+                    user_count += 1
+                    logger.info("  - %s %s (%s)", user_data.get('first_name'), user_data.get('last_name'), user_data.get('phone_number'))
+                logger.info("Would migrate %d users", user_count)
             else:
                 migrated_count = self.migrate_users(tenant, session)
                 if migrated_count == 0:
@@ -268,7 +394,7 @@ class UserMigrator:
             return True
         
         except Exception as e:
-            logger.error(f"❌ Migration failed: {e}")
+            logger.error("❌ Migration failed: %s", e)
             session.rollback()
             return False
         
@@ -291,20 +417,25 @@ class UserMigrator:
         try:
             # Check admins
             admin_count = session.query(Administrator).count()
-            logger.info(f"Administrators in database: {admin_count}")
+            logger.info("Administrators in database: %d", admin_count)
             
             # Check tenants
             tenant_count = session.query(Tenant).count()
-            logger.info(f"Tenants in database: {tenant_count}")
+            logger.info("Tenants in database: %d", tenant_count)
             
             # Check users
             user_count = session.query(User).count()
-            logger.info(f"Users in database: {user_count}")
+            logger.info("Users in database: %d", user_count)
             
-            # List all users
-            users = session.query(User).all()
-            for user in users:
-                logger.info(f"  - {user.full_name} ({user.phone_number}) - Enabled: {user.is_enabled}")
+            # List a sample of users (plain column rows, no ORM objects)
+            sample = session.query(
+                User.first_name, User.last_name, User.phone_number, User.is_enabled
+            ).limit(VERIFY_SAMPLE_SIZE).all()
+            for first_name, last_name, phone_number, is_enabled in sample:
+                full_name = f"{first_name} {last_name}".strip()
+                logger.info("  - %s (%s) - Enabled: %s", full_name, phone_number, is_enabled)
+            if user_count > len(sample):
+                logger.info("  ... and %d more", user_count - len(sample))
             
             logger.info("=" * 70)
             logger.info("✅ VERIFICATION COMPLETE")
@@ -313,7 +444,7 @@ class UserMigrator:
             return admin_count > 0 and tenant_count > 0 and user_count > 0
         
         except Exception as e:
-            logger.error(f"❌ Verification failed: {e}")
+            logger.error("❌ Verification failed: %s", e)
             return False
         
         finally:
@@ -9,24 +9,259 @@ File location: pareto_agents/migrate_users_v2.py
 
 import json
 import os
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
 
 from .database import get_db_session, Administrator, Tenant, User
+from .migrate_users import build_user_row
 from .token_manager import TokenManager
-from .auth import PasswordManager
 
 logger = logging.getLogger(__name__)
 
+# ijson streams the users array so large files never sit in memory whole;
+# without it the whole file is parsed at once
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# orjson parses the whole file much faster than stdlib json when not streaming
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Rows sent per multi-row INSERT while migrating users
+BATCH_SIZE = 500
+
+# Threads reading and encoding token files; the work is file I/O, not CPU
+TOKEN_ENCODE_WORKERS = 16
+
+# Directory the google_token_path entries in users.json are relative to
+TOKENS_ROOT = 'configurations'
+
+# Written next to users.json after a migration without failed users; holds
+# the signature of the users.json (and database) it was migrated into and the
+# admin:tenant:user row counts the database had afterwards
+MIGRATION_MARKER_NAME = '.migrated_v2'
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING
+_UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+
+def _stream_users(users_json_path: str):
+    """Yield user dicts from the 'users' array of users.json one at a time"""
+    with open(users_json_path, 'rb') as f:
+        yield from ijson.items(f, 'users.item')
+
+
+def _scan_token_files(root: str = TOKENS_ROOT) -> Set[str]:
+    """
+    List every file under the token root once
+    
+    Args:
+        root: Directory token paths in users.json are relative to
+        
+    Returns:
+        Normalized paths of all files below root (prefixed with root)
+    """
+    return {
+        os.path.normpath(os.path.join(dirpath, name))
+        for dirpath, _, filenames in os.walk(root)
+        for name in filenames
+    }
+
+
+def _encode_token_file(
+    token_manager: TokenManager,
+    token_files: Set[str],
+    google_token_path: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Encode a user's Google token file (relative to configurations/) to Base64
+    
+    Runs on the token encoding threads, so problems are returned rather than
+    logged to keep the migration log in user order.
+    
+    Args:
+        token_manager: TokenManager used for encoding
+        token_files: Existing token files, from _scan_token_files()
+        google_token_path: Token file path from users.json, if any
+        
+    Returns:
+        Tuple of (Base64 token or None, warning message or None)
+    """
+    if not google_token_path:
+        return None, None
+    
+    full_token_path = os.path.normpath(os.path.join(TOKENS_ROOT, google_token_path))
+    try:
+        if full_token_path not in token_files:
+            return None, f"Token file not found: {full_token_path}"
+        return token_manager.encode_from_file(full_token_path), None
+    except Exception as e:
+        return None, f"Could not encode token: {e}"
+
+
+def _insert_users(session, rows: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Insert user rows with a single multi-row INSERT ... ON CONFLICT DO NOTHING
+    
+    Users that already exist for the tenant (including duplicates within
+    the batch) are skipped by the (tenant_id, phone_number) unique constraint.
+    
+    Args:
+        session: SQLAlchemy session
+        rows: Column-value dicts for the users table
+        
+    Returns:
+        Phone numbers of the users actually inserted
+    """
+    dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is None:
+        # No ON CONFLICT support: plain insert, duplicates fail the migration
+        session.execute(User.__table__.insert(), rows)
+        return {row['phone_number'] for row in rows}
+    
+    stmt = (
+        dialect_insert(User.__table__)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=['tenant_id', 'phone_number'])
+        .returning(User.__table__.c.phone_number)
+    )
+    return {phone for (phone,) in session.execute(stmt)}
+
+
+def _insert_users_isolated(session, rows: List[Dict[str, Any]]) -> Tuple[Set[str], Set[int]]:
+    """
+    Insert a batch inside a savepoint, falling back to one savepoint per row
+    
+    A row the database rejects then fails only that user instead of the
+    whole migration.
+    
+    Args:
+        session: SQLAlchemy session
+        rows: Column-value dicts for the users table
+        
+    Returns:
+        Tuple of (phone numbers inserted, indexes of the rows that failed)
+    """
+    try:
+        with session.begin_nested():
+            return _insert_users(session, rows), set()
+    except SQLAlchemyError as e:
+        logger.warning("⚠️  Batch insert failed, inserting its users one by one: %s", e)
+    
+    inserted = set()
+    failed = set()
+    for index, row in enumerate(rows):
+        try:
+            with session.begin_nested():
+                inserted |= _insert_users(session, [row])
+        except SQLAlchemyError as e:
+            logger.error(
+                "❌ Error migrating user %s %s (%s): %s",
+                row['first_name'], row['last_name'], row['phone_number'], e
+            )
+            failed.add(index)
+    return inserted, failed
+
+
+def _migration_signature(users_json_path: str) -> str:
+    """
+    Identify a users.json version and its target database without opening it
+    
+    Args:
+        users_json_path: Path to users.json file
+        
+    Returns:
+        Signature string stored in (and compared against) the marker file
+    """
+    stat = os.stat(users_json_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{os.environ.get('DATABASE_URL', '')}"
+
+
+def _count_rows(session) -> Tuple[int, int, int]:
+    """
+    Count administrators, tenants and users in a single round trip
+    
+    Args:
+        session: SQLAlchemy session
+        
+    Returns:
+        Tuple of (admin_count, tenant_count, user_count)
+    """
+    counts = select(
+        select(func.count()).select_from(Administrator).scalar_subquery(),
+        select(func.count()).select_from(Tenant).scalar_subquery(),
+        select(func.count()).select_from(User).scalar_subquery(),
+    )
+    return tuple(session.execute(counts).one())
+
+
+def _migration_is_current(marker_path: Path, signature: str) -> bool:
+    """
+    Check whether the marker says this users.json was already migrated
+    
+    The signature alone can't tell if the database was recreated or emptied
+    since, so the row counts recorded with it must still match the database.
+    
+    Args:
+        marker_path: Path to the migration marker file
+        signature: Current _migration_signature() of users.json
+        
+    Returns:
+        True if the migration can be skipped, False otherwise
+    """
+    if not marker_path.exists():
+        return False
+    
+    marker_signature, _, marker_counts = marker_path.read_text().partition('\n')
+    if marker_signature != signature or not marker_counts:
+        return False
+    
+    session = get_db_session()
+    try:
+        counts = ':'.join(str(count) for count in _count_rows(session))
+    except Exception as e:
+        logger.info("ℹ️  Could not check existing data (%s), migrating", e)
+        return False
+    finally:
+        session.close()
+    
+    return counts == marker_counts
+
 
-def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'configurations/users.json') -> bool:
+def migrate_users_from_json_v2(
+    dry_run: bool = False,
+    users_json_path: str = 'configurations/users.json',
+    admin_password_hash: Optional[str] = None,
+    force: bool = False
+) -> bool:
     """
     Migrate users from users.json to SQLite with Base64 tokens
     
     Args:
         dry_run: If True, preview migration without making changes
         users_json_path: Path to users.json file
+        admin_password_hash: Precomputed password hash for the default admin;
+            skips the bcrypt work when given
+        force: If True, migrate even if users.json is unchanged since the
+            last successful migration
         
     Returns:
         True if migration successful, False otherwise
@@ -37,16 +272,32 @@ def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'co
     
     # Check if users.json exists
     if not os.path.exists(users_json_path):
-        logger.warning(f"⚠️  users.json not found at {users_json_path}")
+        logger.warning("⚠️  users.json not found at %s", users_json_path)
         return False
     
+    # Unchanged users.json already migrated into this database, and the
+    # database still holds what that migration left: nothing to do
+    marker_path = Path(users_json_path).with_name(MIGRATION_MARKER_NAME)
+    signature = _migration_signature(users_json_path)
+    if not (force or dry_run) and _migration_is_current(marker_path, signature):
+        logger.info("ℹ️  %s unchanged since last migration, skipping (use --force to re-run)", users_json_path)
+        return True
+    
     try:
         # Load users from JSON
-        with open(users_json_path, 'r') as f:
-            config = json.load(f)
-        
-        users_data = config.get('users', [])
-        logger.info(f"✅ Loaded {len(users_data)} users from {users_json_path}")
+        if IJSON_AVAILABLE:
+            users_data = _stream_users(users_json_path)
+            logger.info("✅ Streaming users from %s", users_json_path)
+        else:
+            if ORJSON_AVAILABLE:
+                # orjson is always UTF-8 and parses bytes directly
+                config = orjson.loads(Path(users_json_path).read_bytes())
+            else:
+                with open(users_json_path, 'r') as f:
+                    config = json.load(f)
+            
+            users_data = config.get('users', [])
+            logger.info("✅ Loaded %s users from %s", len(users_data), users_json_path)
         
         if dry_run:
             logger.info("📋 DRY RUN MODE - No changes will be made")
@@ -58,15 +309,21 @@ def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'co
             # Create default admin if not exists
             admin = session.query(Administrator).filter_by(username='admin').first()
             if not admin and not dry_run:
+                if admin_password_hash is None:
+                    # Only needed (and only pays for the KDF) when creating the admin
+                    from .auth import PasswordManager
+                    admin_password_hash = PasswordManager.hash_password('admin123')
+                
                 admin = Administrator(
                     username='admin',
                     email='admin@avoccado.tech',
-                    password_hash=PasswordManager.hash_password('admin123'),
+                    password_hash=admin_password_hash,
                     full_name='Administrator',
                     is_active=True
                 )
                 session.add(admin)
-                session.commit()
+                # Flush to get admin.id; committed together with the users
+                session.flush()
                 logger.info("✅ Created default admin user: admin")
             elif admin:
                 logger.info("ℹ️  Admin user already exists")
@@ -85,7 +342,8 @@ def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'co
                     created_by_admin_id=admin.id if admin else 1
                 )
                 session.add(tenant)
-                session.commit()
+                # Flush to get tenant.id; committed together with the users
+                session.flush()
                 logger.info("✅ Created default tenant: AVOCCADO Tech")
             elif tenant:
                 logger.info("ℹ️  Tenant already exists")
@@ -94,95 +352,125 @@ def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'co
             
             # Migrate users
             token_manager = TokenManager()
+            tenant_id = tenant.id if tenant else 1
             migrated_count = 0
             failed_count = 0
             
-            for user_data in users_data:
-                try:
-                    phone_number = user_data.get('phone_number')
-                    first_name = user_data.get('first_name', 'Unknown')
-                    last_name = user_data.get('last_name', 'User')
-                    email = user_data.get('email')
-                    enabled = user_data.get('enabled', True)
-                    google_token_path = user_data.get('google_token_path')
-                    
-                    # Check if user already exists
-                    existing_user = session.query(User).filter_by(
-                        tenant_id=tenant.id if tenant else 1,
-                        phone_number=phone_number
-                    ).first()
-                    
-                    if existing_user and not dry_run:
-                        logger.info(f"ℹ️  User already exists: {first_name} {last_name} ({phone_number})")
+            # One directory walk instead of a stat() per user
+            token_files = _scan_token_files()
+            
+            def migrate_batch(batch):
+                """Encode the batch's token files in parallel, then insert its rows"""
+                nonlocal migrated_count, failed_count
+                
+                token_paths = [google_token_path for _, google_token_path in batch]
+                encoded_tokens = list(token_executor.map(
+                    functools.partial(_encode_token_file, token_manager, token_files), token_paths
+                ))
+                
+                # Rows for the next bulk INSERT
+                mappings = [
+                    dict(row, google_token_base64=google_token_base64)
+                    for (row, _), (google_token_base64, _) in zip(batch, encoded_tokens)
+                ]
+                
+                if dry_run:
+                    inserted, failed = {row['phone_number'] for row in mappings}, set()
+                else:
+                    inserted, failed = _insert_users_isolated(session, mappings)
+                failed_count += len(failed)
+                
+                for index, (row, google_token_path, (google_token_base64, token_warning)) in enumerate(zip(
+                    mappings, token_paths, encoded_tokens
+                )):
+                    if index in failed:
                         continue
+                    first_name, last_name, phone_number = row['first_name'], row['last_name'], row['phone_number']
+                    if phone_number not in inserted:
+                        logger.info("ℹ️  User already exists: %s %s (%s)", first_name, last_name, phone_number)
+                        continue
+                    # Later duplicates of the same number in this batch were skipped
+                    inserted.discard(phone_number)
                     
-                    # Load and encode Google token
-                    google_token_base64 = None
-                    if google_token_path:
-                        try:
-                            full_token_path = os.path.join('configurations', google_token_path)
-                            if os.path.exists(full_token_path):
-                                google_token_base64 = token_manager.encode_from_file(full_token_path)
-                                logger.info(f"  ✅ Encoded Google token from: {google_token_path}")
-                            else:
-                                logger.warning(f"  ⚠️  Token file not found: {full_token_path}")
-                        except Exception as e:
-                            logger.warning(f"  ⚠️  Could not encode token: {e}")
-                    
-                    # Create user
-                    if not dry_run:
-                        new_user = User(
-                            tenant_id=tenant.id if tenant else 1,
-                            phone_number=phone_number,
-                            first_name=first_name,
-                            last_name=last_name,
-                            email=email,
-                            is_enabled=enabled,
-                            google_token_base64=google_token_base64
-                        )
-                        session.add(new_user)
-                        session.commit()
+                    if google_token_base64:
+                        logger.info("  ✅ Encoded Google token from: %s", google_token_path)
+                    elif token_warning:
+                        logger.warning("  ⚠️  %s", token_warning)
                     
-                    logger.info(f"✅ Migrated user: {first_name} {last_name} ({phone_number})")
+                    logger.info("✅ Migrated user: %s %s (%s)", first_name, last_name, phone_number)
                     migrated_count += 1
+            
+            # (row, google_token_path) of users whose token files are still
+            # to be encoded
+            pending = []
+            
+            with ThreadPoolExecutor(max_workers=TOKEN_ENCODE_WORKERS) as token_executor:
+                for user_data in users_data:
+                    # Invalid entries are rejected and null fields defaulted
+                    # here, before they can reach the batch INSERT
+                    row = build_user_row(tenant_id, user_data, 'Unknown', 'User')
+                    if row is None:
+                        failed_count += 1
+                        continue
+                    pending.append((row, user_data.get('google_token_path')))
+                    
+                    if len(pending) >= BATCH_SIZE:
+                        migrate_batch(pending)
+                        pending = []
                 
-                except Exception as e:
-                    logger.error(f"❌ Error migrating user: {e}")
-                    failed_count += 1
-                    if not dry_run:
-                        session.rollback()
+                # Migrate the remaining users
+                if pending:
+                    migrate_batch(pending)
             
-            logger.info(f"✅ Successfully migrated {migrated_count} users")
+            # Commit admin, tenant and users at once
+            if not dry_run:
+                session.commit()
+            
+            logger.info("✅ Successfully migrated %s users", migrated_count)
             if failed_count > 0:
-                logger.warning(f"⚠️  Failed to migrate {failed_count} users")
+                logger.warning("⚠️  Failed to migrate %s users", failed_count)
             
             # Verify migration
             logger.info("=" * 70)
             logger.info("VERIFYING MIGRATION")
             logger.info("=" * 70)
             
-            admin_count = session.query(Administrator).count()
-            tenant_count = session.query(Tenant).count()
-            user_count = session.query(User).count()
+            admin_count, tenant_count, user_count = _count_rows(session)
             
-            logger.info(f"Administrators in database: {admin_count}")
-            logger.info(f"Tenants in database: {tenant_count}")
-            logger.info(f"Users in database: {user_count}")
+            logger.info("Administrators in database: %s", admin_count)
+            logger.info("Tenants in database: %s", tenant_count)
+            logger.info("Users in database: %s", user_count)
             
-            # Show user details
-            users = session.query(User).all()
-            for user in users:
-                token_status = "✅ Has token" if user.has_google_token() else "❌ No token"
-                logger.info(f"  - {user.full_name} ({user.phone_number}) - Enabled: {user.is_enabled} - {token_status}")
+            # Show user details (plain column rows, no ORM objects; only the
+            # token length is fetched, not the token itself)
+            users = session.query(
+                User.first_name,
+                User.last_name,
+                User.phone_number,
+                User.is_enabled,
+                func.length(User.google_token_base64),
+            ).all()
+            for first_name, last_name, phone_number, is_enabled, token_length in users:
+                full_name = f"{first_name} {last_name}".strip()
+                token_status = "✅ Has token" if token_length else "❌ No token"
+                logger.info("  - %s (%s) - Enabled: %s - %s", full_name, phone_number, is_enabled, token_status)
             
             logger.info("=" * 70)
             logger.info("✅ VERIFICATION COMPLETE")
             logger.info("=" * 70)
             
+            # Only a complete migration is recorded, so failed users are
+            # retried on the next run
+            if not dry_run and failed_count == 0:
+                try:
+                    marker_path.write_text(f"{signature}\n{admin_count}:{tenant_count}:{user_count}")
+                except OSError as e:
+                    logger.warning("⚠️  Could not write migration marker %s: %s", marker_path, e)
+            
             return True
         
         except Exception as e:
-            logger.error(f"❌ Migration error: {e}")
+            logger.error("❌ Migration error: %s", e)
             session.rollback()
             return False
         
@@ -190,7 +478,7 @@ def migrate_users_from_json_v2(dry_run: bool = False, users_json_path: str = 'co
             session.close()
     
     except Exception as e:
-        logger.error(f"❌ Error reading users.json: {e}")
+        logger.error("❌ Error reading users.json: %s", e)
         return False
 
 
@@ -205,9 +493,7 @@ def verify_migration_v2() -> bool:
     
     session = get_db_session()
     try:
-        admin_count = session.query(Administrator).count()
-        tenant_count = session.query(Tenant).count()
-        user_count = session.query(User).count()
+        admin_count, tenant_count, user_count = _count_rows(session)
         
         if admin_count == 0:
             logger.error("❌ No administrators found")
@@ -221,11 +507,11 @@ def verify_migration_v2() -> bool:
             logger.error("❌ No users found")
             return False
         
-        logger.info(f"✅ Migration verified: {admin_count} admins, {tenant_count} tenants, {user_count} users")
+        logger.info("✅ Migration verified: %s admins, %s tenants, %s users", admin_count, tenant_count, user_count)
         return True
     
     except Exception as e:
-        logger.error(f"❌ Verification error: {e}")
+        logger.error("❌ Verification error: %s", e)
         return False
     
     finally:
@@ -244,8 +530,22 @@ if __name__ == '__main__':
     # Check for dry-run flag
     dry_run = '--dry-run' in sys.argv
     
+    # Optional precomputed admin password hash: --admin-password-hash <hash>
+    admin_password_hash = None
+    if '--admin-password-hash' in sys.argv:
+        flag_index = sys.argv.index('--admin-password-hash')
+        if flag_index + 1 < len(sys.argv):
+            admin_password_hash = sys.argv[flag_index + 1]
+    
+    # Re-run even if users.json is unchanged since the last migration
+    force = '--force' in sys.argv
+    
     # Run migration
-    success = migrate_users_from_json_v2(dry_run=dry_run)
+    success = migrate_users_from_json_v2(
+        dry_run=dry_run,
+        admin_password_hash=admin_password_hash,
+        force=force
+    )
     
     if success:
         logger.info("✅ Migration completed successfully")
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import re
+import threading
 from typing import Optional, Dict, Any
 from agents import Agent, Runner
 from .date_utils import get_current_date_context
@@ -16,31 +19,33 @@ logger = logging.getLogger(__name__)
 # Personal Assistant Agent Definition
 # ============================================================================
 
+# Static part of the instructions: one constant instead of a chain of
+# adjacent literals; only the date context is formatted in at build time
+_INSTRUCTIONS = """\
+You are a personal assistant that helps users with complex tasks involving calendar and email management. You have access to tools that allow you to:
+1. Get calendar events (today, specific date, week, or summary)
+2. Get email summaries (unread, recent, or search results)
+3. Generate combined daily summaries
+
+Your responsibilities:
+- Help users get summaries of their meetings and events
+- Provide lists of upcoming events or emails
+- Generate daily briefings combining calendar and email information
+- Answer questions about their schedule and communications
+
+When a user asks for information about their calendar or emails:
+1. Use the appropriate tool to fetch the data
+2. Format the results in a clear, readable way
+3. Provide helpful context and insights
+
+Be proactive and helpful. If a user asks for a summary, provide it in a well-organized format. \
+Always be clear about what information you're retrieving and why."""
+
 personal_assistant_agent = Agent(
     name="Personal Assistant",
     tools=ASSISTANT_TOOLS,
     handoff_description="Specialist agent for complex multi-step tasks combining calendar and email operations",
-    instructions=(
-        f"IMPORTANT: {get_current_date_context()} You are a personal assistant that helps users with complex tasks involving calendar and email management. "
-        "You have access to tools that allow you to:\n"
-        "1. Get calendar events (today, specific date, week, or summary)\n"
-        "2. Get email summaries (unread, recent, or search results)\n"
-        "3. Generate combined daily summaries\n"
-        "\n"
-        "Your responsibilities:\n"
-        "- Help users get summaries of their meetings and events\n"
-        "- Provide lists of upcoming events or emails\n"
-        "- Generate daily briefings combining calendar and email information\n"
-        "- Answer questions about their schedule and communications\n"
-        "\n"
-        "When a user asks for information about their calendar or emails:\n"
-        "1. Use the appropriate tool to fetch the data\n"
-        "2. Format the results in a clear, readable way\n"
-        "3. Provide helpful context and insights\n"
-        "\n"
-        "Be proactive and helpful. If a user asks for a summary, provide it in a well-organized format. "
-        "Always be clear about what information you're retrieving and why."
-    ),
+    instructions=f"IMPORTANT: {get_current_date_context()} {_INSTRUCTIONS}",
 )
 
 
@@ -48,6 +53,29 @@ personal_assistant_agent = Agent(
 # Task Routing Logic
 # ============================================================================
 
+# Complex task keywords
+_COMPLEX_KEYWORDS = (
+    'summary', 'summarize', 'overview', 'list', 'show me',
+    'what are', 'how many', 'tell me about', 'brief',
+    'schedule for', 'meetings on', 'events on', 'emails from',
+    'unread', 'recent', 'upcoming', 'today', 'this week',
+    'compare', 'between', 'combined', 'all my'
+)
+
+# Simple task keywords
+_SIMPLE_KEYWORDS = (
+    'book', 'schedule', 'create', 'send', 'compose',
+    'delete', 'cancel', 'update', 'reschedule',
+    'mail me'
+)
+
+# One alternation per keyword set: a single C-level scan instead of a
+# substring search per keyword. Matched against the lowercased message,
+# so keywords match anywhere (not only on word boundaries), as before.
+_COMPLEX_RE = re.compile('|'.join(map(re.escape, _COMPLEX_KEYWORDS)))
+_SIMPLE_RE = re.compile('|'.join(map(re.escape, _SIMPLE_KEYWORDS)))
+
+
 def is_complex_task(message: str) -> bool:
     """
     Determine if a message requires the Personal Assistant (complex task)
@@ -72,28 +100,12 @@ def is_complex_task(message: str) -> bool:
     """
     message_lower = message.lower()
     
-    # Complex task keywords
-    complex_keywords = [
-        'summary', 'summarize', 'overview', 'list', 'show me',
-        'what are', 'how many', 'tell me about', 'brief',
-        'schedule for', 'meetings on', 'events on', 'emails from',
-        'unread', 'recent', 'upcoming', 'today', 'this week',
-        'compare', 'between', 'combined', 'all my'
-    ]
-    
-    # Simple task keywords
-    simple_keywords = [
-        'book', 'schedule', 'create', 'send', 'compose',
-        'delete', 'cancel', 'update', 'reschedule',
-        'mail me'
-    ]
-    
     # Check for complex keywords
-    if any(keyword in message_lower for keyword in complex_keywords):
+    if _COMPLEX_RE.search(message_lower):
         return True
     
     # Check for simple keywords (if found, likely not complex)
-    if any(keyword in message_lower for keyword in simple_keywords):
+    if _SIMPLE_RE.search(message_lower):
         return False
     
     # Default to complex for ambiguous cases
@@ -132,8 +144,12 @@ async def process_complex_task(
         
         logger.info(f"Personal Assistant processing complete")
         
-        # Extract response from result
-        if hasattr(result, 'raw_responses') and result.raw_responses:
+        # Extract response from result; final_output is the text the SDK
+        # already extracted from the last turn, so no walk of raw_responses
+        final_output = getattr(result, 'final_output', None)
+        if final_output:
+            agent_response = str(final_output)
+        elif getattr(result, 'raw_responses', None):
             last_response = result.raw_responses[-1] if isinstance(result.raw_responses, list) else result.raw_responses
             agent_response = last_response.output[0].content[0].text
         else:
@@ -162,6 +178,28 @@ async def process_complex_task(
 # Synchronous Wrapper for Flask
 # ============================================================================
 
+# One event loop, running forever in a daemon thread, serves every sync call so
+# the Runner's HTTP clients and connection pools stay warm between requests
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="personal-assistant-loop",
+                    daemon=True,
+                ).start()
+                _background_loop = loop
+    return _background_loop
+
+
 def process_complex_task_sync(
     message: str,
     phone_number: str,
@@ -178,22 +216,14 @@ def process_complex_task_sync(
     Returns:
         dict: Processing result
     """
-    import asyncio
-    
     try:
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        # Run async function
-        result = loop.run_until_complete(
-            process_complex_task(message, phone_number, user_data)
+        # Run async function on the shared background loop
+        future = asyncio.run_coroutine_threadsafe(
+            process_complex_task(message, phone_number, user_data),
+            _get_background_loop(),
         )
         
-        return result
+        return future.result()
     
     except Exception as e:
         logger.error(f"Error in sync wrapper: {str(e)}", exc_info=True)
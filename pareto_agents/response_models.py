@@ -6,10 +6,11 @@ Flexible schema to handle various response formats from the agents SDK
 File location: pareto_agents/response_models.py
 """
 
-from typing import List, Optional, Any, Union
-from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing import Dict, List, Optional, Any, Tuple, Union
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, field_validator, model_validator
 import logging
 import json
+import weakref
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +122,59 @@ class ModelResponse(ParetoBaseModel):
 # Response Extraction Functions with Pydantic
 # ============================================================================
 
+# Parsed ModelResponse (or None) per response object, keyed by id() and
+# evicted when the object is garbage collected. SDK responses are not
+# hashable, so a WeakKeyDictionary can't hold them.
+_parsed_responses: Dict[int, Tuple[weakref.ref, Optional[ModelResponse]]] = {}
+
+
+def _remember_parsed(response: Any, model_response: Optional[ModelResponse]) -> None:
+    """Cache the parse result for a response object, if it supports weakrefs"""
+    key = id(response)
+    
+    def evict(ref: weakref.ref) -> None:
+        # The id may already belong to a newer object; only drop our own entry
+        cached = _parsed_responses.get(key)
+        if cached is not None and cached[0] is ref:
+            _parsed_responses.pop(key, None)
+    
+    try:
+        _parsed_responses[key] = (weakref.ref(response, evict), model_response)
+    except TypeError:
+        pass
+
+
+def _parse_response_object(response: Any) -> Optional[ModelResponse]:
+    """
+    Parse a response object (Pydantic model or plain object) into a ModelResponse
+    
+    Args:
+        response: Response object from agent
+        
+    Returns:
+        ModelResponse: Parsed response or None if parsing fails
+    """
+    # Try model_dump if it's a Pydantic model
+    if hasattr(response, 'model_dump'):
+        try:
+            return ModelResponse.model_validate(response.model_dump())
+        except Exception as e:
+            logger.debug("Could not parse model_dump: %s", e)
+    
+    # Try to extract attributes manually
+    try:
+        response_dict = {
+            'output': getattr(response, 'output', []),
+            'usage': getattr(response, 'usage', None),
+            'response_id': getattr(response, 'response_id', ''),
+        }
+        return ModelResponse.model_validate(response_dict)
+    except Exception as e:
+        logger.debug("Could not extract attributes: %s", e)
+    
+    return None
+
+
 def parse_model_response(response: Any) -> Optional[ModelResponse]:
     """
     Parse any response format into a ModelResponse Pydantic model
@@ -140,9 +194,9 @@ def parse_model_response(response: Any) -> Optional[ModelResponse]:
         # Dict format - parse with Pydantic
         if isinstance(response, dict):
             try:
-                return ModelResponse(**response)
+                return ModelResponse.model_validate(response)
             except Exception as e:
-                logger.debug(f"Could not parse dict as ModelResponse: {e}")
+                logger.debug("Could not parse dict as ModelResponse: %s", e)
                 # Try to extract what we can
                 return ModelResponse(
                     output=response.get('output', []),
@@ -150,31 +204,28 @@ def parse_model_response(response: Any) -> Optional[ModelResponse]:
                     response_id=response.get('response_id', ''),
                 )
         
-        # Try to convert object to dict first
+        # Response objects are parsed once; the text/usage/id/summary helpers
+        # all reuse that parse
         if hasattr(response, '__dict__'):
-            # Try model_dump if it's a Pydantic model
-            if hasattr(response, 'model_dump'):
-                try:
-                    return ModelResponse(**response.model_dump())
-                except Exception as e:
-                    logger.debug(f"Could not parse model_dump: {e}")
-            
-            # Try to extract attributes manually
-            try:
-                response_dict = {
-                    'output': getattr(response, 'output', []),
-                    'usage': getattr(response, 'usage', None),
-                    'response_id': getattr(response, 'response_id', ''),
-                }
-                return ModelResponse(**response_dict)
-            except Exception as e:
-                logger.debug(f"Could not extract attributes: {e}")
+            cached = _parsed_responses.get(id(response))
+            if cached is not None and cached[0]() is response:
+                model_response = cached[1]
+            else:
+                model_response = _parse_response_object(response)
+                _remember_parsed(response, model_response)
+            if model_response is not None:
+                return model_response
         
-        logger.warning(f"Could not parse response of type: {type(response)}")
+        logger.warning("Could not parse response of type: %s", type(response))
+        return None
+    
+    except ValidationError as e:
+        # Malformed response data: expected, so no traceback
+        logger.debug("Could not parse response as ModelResponse: %s", e)
         return None
     
     except Exception as e:
-        logger.error(f"Error parsing ModelResponse: {str(e)}", exc_info=True)
+        logger.error("Error parsing ModelResponse: %s", e, exc_info=True)
         return None
 
 
@@ -190,50 +241,56 @@ def extract_text_from_raw_response(response: Any) -> str:
         str: Extracted text or empty string
     """
     try:
-        logger.info(f"Attempting raw extraction from {type(response).__name__}")
-        
-        # Try to access output attribute
-        if hasattr(response, 'output'):
-            logger.info(f"Response has 'output' attribute")
-            output = getattr(response, 'output', None)
-            logger.info(f"Output type: {type(output).__name__}, value: {output}")
+        # One getattr per level: a missing attribute and an empty value are
+        # both skipped, so no separate hasattr check is needed
+        output = getattr(response, 'output', None)
+        if output:
+            output_list = output if isinstance(output, list) else [output]
             
-            if output:
-                output_list = output if isinstance(output, list) else [output]
-                logger.info(f"Processing {len(output_list)} output items")
+            for output_msg in output_list:
+                content = getattr(output_msg, 'content', None)
+                if not content:
+                    continue
+                content_list = content if isinstance(content, list) else [content]
                 
-                for i, output_msg in enumerate(output_list):
-                    logger.info(f"Output item {i}: {type(output_msg).__name__}")
-                    
-                    if hasattr(output_msg, 'content'):
-                        content = getattr(output_msg, 'content', None)
-                        logger.info(f"Content type: {type(content).__name__}, value: {content}")
-                        
-                        if content:
-                            content_list = content if isinstance(content, list) else [content]
-                            logger.info(f"Processing {len(content_list)} content items")
-                            
-                            for j, content_item in enumerate(content_list):
-                                logger.info(f"Content item {j}: {type(content_item).__name__}")
-                                
-                                if hasattr(content_item, 'text'):
-                                    text = getattr(content_item, 'text', None)
-                                    logger.info(f"Found text: {text}")
-                                    
-                                    if text:
-                                        text_str = str(text).strip()
-                                        if text_str:
-                                            logger.info(f"Extracted text: {text_str[:100]}")
-                                            return text_str
+                for content_item in content_list:
+                    text = getattr(content_item, 'text', None)
+                    if text:
+                        text_str = str(text).strip()
+                        if text_str:
+                            logger.debug("Extracted text from raw %s: %.100s", type(response).__name__, text_str)
+                            return text_str
         
-        logger.info("No text found in raw response")
+        logger.debug("No text found in raw %s", type(response).__name__)
         return ""
     
     except Exception as e:
-        logger.error(f"Error extracting text from raw response: {e}", exc_info=True)
+        logger.error("Error extracting text from raw response: %s", e, exc_info=True)
         return ""
 
 
+def _extract_text_from_dict(response: dict) -> str:
+    """
+    Extract the first non-empty output text from a dict response
+    
+    Args:
+        response: Response dict with an 'output' list of messages
+        
+    Returns:
+        str: Extracted text or empty string
+    """
+    for message in response.get('output') or ():
+        if not isinstance(message, dict):
+            continue
+        for content_item in message.get('content') or ():
+            text = content_item.get('text') if isinstance(content_item, dict) else None
+            if text:
+                text_str = str(text).strip()
+                if text_str:
+                    return text_str
+    return ""
+
+
 def get_response_text(response: Any) -> str:
     """
     Extract text from any response format using Pydantic
@@ -250,47 +307,37 @@ def get_response_text(response: Any) -> str:
             logger.warning("Response is None")
             return ""
         
-        # Log response type and structure
-        logger.info(f"=== RESPONSE EXTRACTION START ===")
-        logger.info(f"Response type: {type(response).__name__}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # str() of an SDK response can be large; only build it when logged
+            logger.debug("Extracting text from %s: %.300s", type(response).__name__, response)
         
-        # Try to get string representation
-        try:
-            response_str = str(response)[:300]
-            logger.info(f"Response string: {response_str}")
-        except Exception as e:
-            logger.info(f"Could not convert response to string: {e}")
+        # Strategy 0: read the text straight out of dict responses; building a
+        # ModelResponse just to take one string out of it is wasted work
+        if isinstance(response, dict):
+            text = _extract_text_from_dict(response)
+            if text:
+                logger.debug("✅ Extracted text from dict response: %.80s", text)
+                return text
         
         # Strategy 1: Try to parse as ModelResponse
-        logger.info("Strategy 1: Parsing as ModelResponse")
         model_response = parse_model_response(response)
-        
         if model_response:
             text = model_response.get_text()
-            logger.info(f"ModelResponse parsed, text: '{text}'")
             if text:
-                logger.info(f"✅ Successfully extracted text using Pydantic: {text[:80]}")
-                logger.info(f"=== RESPONSE EXTRACTION END ===")
+                logger.debug("✅ Extracted text using Pydantic: %.80s", text)
                 return text
-        else:
-            logger.info("Could not parse as ModelResponse")
         
         # Strategy 2: Try direct attribute access (raw object)
-        logger.info("Strategy 2: Raw attribute access")
         text = extract_text_from_raw_response(response)
-        logger.info(f"Raw extraction result: '{text}'")
         if text:
-            logger.info(f"✅ Extracted text using raw attribute access: {text[:80]}")
-            logger.info(f"=== RESPONSE EXTRACTION END ===")
+            logger.debug("✅ Extracted text using raw attribute access: %.80s", text)
             return text
         
-        logger.warning(f"❌ Could not extract text from response - all strategies failed")
-        logger.info(f"=== RESPONSE EXTRACTION END ===")
+        logger.warning("❌ Could not extract text from response - all strategies failed")
         return ""
     
     except Exception as e:
-        logger.error(f"Error extracting text from response: {str(e)}", exc_info=True)
-        logger.info(f"=== RESPONSE EXTRACTION END (ERROR) ===")
+        logger.error("Error extracting text from response: %s", e, exc_info=True)
         return ""
 
 
@@ -305,6 +352,16 @@ def get_response_usage(response: Any) -> Optional[dict]:
         dict: Usage information or None
     """
     try:
+        # Only the usage part needs validating, not the whole response
+        if isinstance(response, dict):
+            usage = response.get('usage')
+        else:
+            usage = getattr(response, 'usage', None)
+        if isinstance(usage, Usage):
+            return usage.model_dump()
+        if isinstance(usage, dict):
+            return Usage.model_validate(usage).model_dump()
+        
         model_response = parse_model_response(response)
         
         if model_response and model_response.usage:
@@ -313,7 +370,7 @@ def get_response_usage(response: Any) -> Optional[dict]:
         return None
     
     except Exception as e:
-        logger.debug(f"Could not extract usage: {e}")
+        logger.debug("Could not extract usage: %s", e)
         return None
 
 
@@ -328,18 +385,20 @@ def get_response_id(response: Any) -> str:
         str: Response ID or empty string
     """
     try:
-        model_response = parse_model_response(response)
-        
-        if model_response:
-            return model_response.response_id
+        # A plain lookup is enough: parsing only ever copies this field (or
+        # defaults it to "")
+        if isinstance(response, dict):
+            response_id = response.get('response_id')
+        else:
+            response_id = getattr(response, 'response_id', None)
         
-        if hasattr(response, 'response_id'):
-            return str(response.response_id)
+        if response_id:
+            return str(response_id).strip()
         
         return ""
     
     except Exception as e:
-        logger.debug(f"Could not extract response ID: {e}")
+        logger.debug("Could not extract response ID: %s", e)
         return ""
 
 
@@ -354,6 +413,16 @@ def validate_response(response: Any) -> bool:
         bool: True if valid, False otherwise
     """
     try:
+        # Valid means "has text": stop at the first text found, walking the
+        # data directly instead of building a ModelResponse
+        if isinstance(response, ModelResponse):
+            return bool(response.get_text())
+        if isinstance(response, dict):
+            return bool(_extract_text_from_dict(response))
+        if extract_text_from_raw_response(response):
+            return True
+        
+        # Objects that only expose their data through model_dump()
         model_response = parse_model_response(response)
         if model_response and model_response.get_text():
             return True
@@ -376,11 +445,13 @@ def get_response_summary(response: Any) -> dict:
         model_response = parse_model_response(response)
         
         if model_response:
+            text = model_response.get_text()
+            usage = model_response.usage
             return {
-                'text': model_response.get_text(),
-                'usage': model_response.usage.model_dump() if model_response.usage else None,
+                'text': text,
+                'usage': usage.model_dump() if usage else None,
                 'response_id': model_response.response_id,
-                'valid': bool(model_response.get_text()),
+                'valid': bool(text),
             }
         
         return {
@@ -6,12 +6,45 @@ File location: pareto_agents/task_executors.py
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 
+from .assistant_tools import (
+    get_calendar_events,
+    get_email_summary,
+    format_calendar_list,
+    format_email_list,
+)
+
 logger = logging.getLogger(__name__)
 
+# Calendar and email fetches are independent network calls; summaries run
+# them side by side instead of one after the other
+SUMMARY_FETCH_WORKERS = 8
+_summary_fetch_executor = ThreadPoolExecutor(
+    max_workers=SUMMARY_FETCH_WORKERS, thread_name_prefix="summary-fetch"
+)
+
+# ISO 8601 date prefix (date-only and date-time starts) of calendar events
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Static tail of the meeting prep summary (joined after the event list)
+_MEETING_PREP_TIPS = "\n".join((
+    "",
+    "**Preparation Tips:**",
+    "- Review meeting agendas and attendees",
+    "- Prepare relevant documents and materials",
+    "- Check for any pre-meeting requirements",
+))
+
+# Separator between daily summary sections per format_type (default: text)
+_SUMMARY_SEPARATORS = {
+    "html": "<br><br>",
+}
+
 
 # ============================================================================
 # Task Models (Pydantic)
@@ -70,39 +103,43 @@ def execute_daily_summary(request: DailySummaryRequest) -> TaskResult:
     try:
         logger.info(f"Executing daily summary for {request.phone_number}")
         
-        from .assistant_tools import (
-            get_calendar_events,
-            get_email_summary,
-            format_calendar_list,
-            format_email_list,
-        )
-        
         summary_parts = []
         data = {}
         
-        # Get calendar events
+        # Start both fetches before waiting on either
+        calendar_future = None
         if request.include_calendar:
             logger.debug("Fetching calendar events for daily summary")
-            calendar_result = get_calendar_events(
+            calendar_future = _summary_fetch_executor.submit(
+                get_calendar_events,
                 phone_number=request.phone_number,
                 operation="list_today",
                 include_details=False
             )
-            data["calendar"] = calendar_result
-            
-            if calendar_result.get("success"):
-                summary_parts.append(f"📅 **Calendar**: {calendar_result.get('summary')}")
-                if calendar_result.get("events"):
-                    summary_parts.append(format_calendar_list(calendar_result.get("events")))
         
-        # Get email summary
+        email_future = None
         if request.include_emails:
             logger.debug("Fetching email summary for daily summary")
-            email_result = get_email_summary(
+            email_future = _summary_fetch_executor.submit(
+                get_email_summary,
                 phone_number=request.phone_number,
                 operation="list_unread",
                 limit=request.email_limit
             )
+        
+        # Calendar events
+        if calendar_future is not None:
+            calendar_result = calendar_future.result()
+            data["calendar"] = calendar_result
+            
+            if calendar_result.get("success"):
+                summary_parts.append(f"📅 **Calendar**: {calendar_result.get('summary')}")
+                if calendar_result.get("events"):
+                    summary_parts.append(format_calendar_list(calendar_result.get("events")))
+        
+        # Email summary
+        if email_future is not None:
+            email_result = email_future.result()
             data["emails"] = email_result
             
             if email_result.get("success"):
@@ -111,12 +148,7 @@ def execute_daily_summary(request: DailySummaryRequest) -> TaskResult:
                     summary_parts.append(format_email_list(email_result.get("emails")))
         
         # Combine summary
-        if request.format_type == "markdown":
-            combined_summary = "\n\n".join(summary_parts)
-        elif request.format_type == "html":
-            combined_summary = "<br><br>".join(summary_parts)
-        else:  # text
-            combined_summary = "\n\n".join(summary_parts)
+        combined_summary = _SUMMARY_SEPARATORS.get(request.format_type, "\n\n").join(summary_parts)
         
         logger.info(f"Daily summary generated successfully")
         
@@ -141,6 +173,28 @@ def execute_daily_summary(request: DailySummaryRequest) -> TaskResult:
 # Meeting Preparation Executor
 # ============================================================================
 
+def _event_start_timestamp(event: Dict[str, Any]) -> Optional[float]:
+    """
+    Get an event's start time as a POSIX timestamp
+    
+    Args:
+        event: Calendar event dict with an ISO 8601 'start'
+        
+    Returns:
+        Start timestamp (naive times are taken as local), or None if the
+        start can't be parsed
+    """
+    start = event.get("start")
+    # Missing, non-string and non-ISO starts are rejected without raising;
+    # only strings that look like an ISO date reach fromisoformat
+    if not isinstance(start, str) or not _ISO_DATE_RE.match(start):
+        return None
+    try:
+        return datetime.fromisoformat(start.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
 def execute_meeting_prep(request: MeetingPrepRequest) -> TaskResult:
     """
     Execute meeting preparation task - get upcoming meetings and relevant info
@@ -154,11 +208,6 @@ def execute_meeting_prep(request: MeetingPrepRequest) -> TaskResult:
     try:
         logger.info(f"Executing meeting prep for {request.phone_number}")
         
-        from .assistant_tools import (
-            get_calendar_events,
-            format_calendar_list,
-        )
-        
         # Get today's or specified date's events
         target_date = request.date if request.date else datetime.now().strftime("%Y-%m-%d")
         
@@ -179,19 +228,17 @@ def execute_meeting_prep(request: MeetingPrepRequest) -> TaskResult:
         
         events = calendar_result.get("events", [])
         
-        # Filter events within the specified hours
-        upcoming_events = []
-        now = datetime.now()
-        cutoff_time = now + timedelta(hours=request.hours_before)
+        # Filter events within the specified hours, comparing POSIX timestamps
+        # so offset-aware and naive (local) start times compare alike
+        now_ts = datetime.now().timestamp()
+        cutoff_ts = now_ts + timedelta(hours=request.hours_before).total_seconds()
         
-        for event in events:
-            try:
-                event_start = datetime.fromisoformat(event.get("start", "").replace("Z", "+00:00"))
-                if now <= event_start <= cutoff_time:
-                    upcoming_events.append(event)
-            except (ValueError, AttributeError):
-                # If we can't parse the time, include it anyway
-                upcoming_events.append(event)
+        # Events whose time can't be parsed are included anyway
+        upcoming_events = [
+            event
+            for event, start_ts in zip(events, map(_event_start_timestamp, events))
+            if start_ts is None or now_ts <= start_ts <= cutoff_ts
+        ]
         
         # Generate preparation summary
         summary_lines = [
@@ -202,11 +249,7 @@ def execute_meeting_prep(request: MeetingPrepRequest) -> TaskResult:
         
         if upcoming_events:
             summary_lines.append(format_calendar_list(upcoming_events))
-            summary_lines.append("")
-            summary_lines.append("**Preparation Tips:**")
-            summary_lines.append("- Review meeting agendas and attendees")
-            summary_lines.append("- Prepare relevant documents and materials")
-            summary_lines.append("- Check for any pre-meeting requirements")
+            summary_lines.append(_MEETING_PREP_TIPS)
         else:
             summary_lines.append("No meetings scheduled in the specified timeframe.")
         
@@ -252,25 +295,21 @@ def execute_weekly_summary(request: WeeklySummaryRequest) -> TaskResult:
     try:
         logger.info(f"Executing weekly summary for {request.phone_number}")
         
-        from .assistant_tools import (
+        # Get week's events and the email summary concurrently
+        calendar_future = _summary_fetch_executor.submit(
             get_calendar_events,
-            get_email_summary,
-            format_calendar_list,
-        )
-        
-        # Get week's events
-        calendar_result = get_calendar_events(
             phone_number=request.phone_number,
             operation="list_week",
             include_details=False
         )
-        
-        # Get email summary
-        email_result = get_email_summary(
+        email_future = _summary_fetch_executor.submit(
+            get_email_summary,
             phone_number=request.phone_number,
             operation="get_summary",
             limit=20
         )
+        calendar_result = calendar_future.result()
+        email_result = email_future.result()
         
         summary_lines = ["📊 **Weekly Summary**", ""]
         
@@ -294,9 +333,11 @@ def execute_weekly_summary(request: WeeklySummaryRequest) -> TaskResult:
         
         # Add weekly insights
         if request.include_metrics:
-            summary_lines.append("**Weekly Insights:**")
-            summary_lines.append(f"- Total meetings: {calendar_result.get('count', 0)}")
-            summary_lines.append(f"- Email activity: {email_result.get('count', 0)} messages")
+            summary_lines.extend((
+                "**Weekly Insights:**",
+                f"- Total meetings: {calendar_result.get('count', 0)}",
+                f"- Email activity: {email_result.get('count', 0)} messages",
+            ))
         
         combined_summary = "\n".join(summary_lines)
         
@@ -326,6 +367,14 @@ def execute_weekly_summary(request: WeeklySummaryRequest) -> TaskResult:
 # Task Dispatcher
 # ============================================================================
 
+# Task type -> (request model, executor)
+_TASK_DISPATCH = {
+    "daily_summary": (DailySummaryRequest, execute_daily_summary),
+    "meeting_prep": (MeetingPrepRequest, execute_meeting_prep),
+    "weekly_summary": (WeeklySummaryRequest, execute_weekly_summary),
+}
+
+
 def execute_task(task_type: str, request_data: Dict[str, Any]) -> TaskResult:
     """
     Dispatch and execute a task based on type
@@ -340,19 +389,8 @@ def execute_task(task_type: str, request_data: Dict[str, Any]) -> TaskResult:
     try:
         logger.info(f"Executing task: {task_type}")
         
-        if task_type == "daily_summary":
-            request = DailySummaryRequest(**request_data)
-            return execute_daily_summary(request)
-        
-        elif task_type == "meeting_prep":
-            request = MeetingPrepRequest(**request_data)
-            return execute_meeting_prep(request)
-        
-        elif task_type == "weekly_summary":
-            request = WeeklySummaryRequest(**request_data)
-            return execute_weekly_summary(request)
-        
-        else:
+        entry = _TASK_DISPATCH.get(task_type)
+        if entry is None:
             logger.error(f"Unknown task type: {task_type}")
             return TaskResult(
                 success=False,
@@ -360,6 +398,9 @@ def execute_task(task_type: str, request_data: Dict[str, Any]) -> TaskResult:
                 summary="",
                 error=f"Unknown task type: {task_type}"
             )
+        
+        request_model, executor = entry
+        return executor(request_model.model_validate(request_data))
     
     except Exception as e:
         logger.error(f"Error executing task: {str(e)}", exc_info=True)
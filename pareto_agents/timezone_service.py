@@ -6,12 +6,111 @@ Handles both relative dates (tomorrow, Monday) and absolute dates (7 June, 2025-
 File location: pareto_agents/timezone_service.py
 """
 
+import functools
 import logging
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once here rather than looked up in re's pattern
+# cache on every parse
+
+# Month names (full and abbreviated) for the absolute formats
+_MONTH_NAMES = (
+    r'January|February|March|April|May|June|July|August|September|October|November|December'
+    r'|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec'
+)
+_MONTHS = '(' + _MONTH_NAMES + ')'
+
+# Month number by the first three letters, which identify every full and
+# abbreviated name in _MONTHS
+_MONTH_NUMBERS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Verbose: "Tomorrow (2024-06-13) at 16:00 CET"
+_VERBOSE_DATE_RE = re.compile(r'\((\d{4})-(\d{2})-(\d{2})\)')
+_VERBOSE_TIME_RE = re.compile(r'at\s+(\d{1,2}):(\d{2})', re.IGNORECASE)
+
+# Relative (matched against the lowercased string): "in 2 hours", "... at 2pm"
+_IN_OFFSET_RE = re.compile(r'in\s+(\d+)\s+(hours?|minutes?)')
+_RELATIVE_TIME_RE = re.compile(r'at\s+(\d{1,2}):?(\d{0,2})\s*(am|pm)?')
+
+# Relative day words in precedence order, matched anywhere in the lowercased
+# string (no word boundaries, so "todays" still counts as "today")
+_RELATIVE_DAYS = (
+    'tomorrow', 'today',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+)
+_RELATIVE_DAY_RE = re.compile('|'.join(_RELATIVE_DAYS))
+_RELATIVE_DAY_PRIORITY = {day: index for index, day in enumerate(_RELATIVE_DAYS)}
+
+# Absolute with a time: "7 June [2025] at 4pm" (d1/m1/y1 groups) and
+# "June 7 [2025] at 4pm" (d2/m2/y2 groups)
+_ABS_DAY_MONTH_PART = r'(?P<d1>\d{1,2})\s+(?P<m1>' + _MONTH_NAMES + r')\s+(?:(?P<y1>\d{4})\s+)?'
+_ABS_MONTH_DAY_PART = r'(?P<m2>' + _MONTH_NAMES + r')\s+(?P<d2>\d{1,2})(?:\s+(?P<y2>\d{4}))?\s+'
+_ABS_AT_TIME_PART = r'at\s+(?P<h>\d{1,2}):?(?P<mn>\d{0,2})\s*(?P<ap>am|pm)?'
+
+# Either order in one pass; at each position the day-first side is tried first
+_ABS_DATE_TIME_RE = re.compile(
+    r'(?:' + _ABS_DAY_MONTH_PART + r'|' + _ABS_MONTH_DAY_PART + r')' + _ABS_AT_TIME_PART, re.IGNORECASE
+)
+_ABS_DAY_MONTH_TIME_RE = re.compile(_ABS_DAY_MONTH_PART + _ABS_AT_TIME_PART, re.IGNORECASE)
+
+# Absolute, date only: "7 June 2025", "7 June"
+_ABS_DAY_MONTH_YEAR_RE = re.compile(r'(\d{1,2})\s+' + _MONTHS + r'\s+(\d{4})', re.IGNORECASE)
+_ABS_DAY_MONTH_RE = re.compile(r'(\d{1,2})\s+' + _MONTHS + r'(?!\s*\d)', re.IGNORECASE)
+
+# Absolute, date only: "November 20, 2026", "November 20"
+_ABS_MONTH_DAY_YEAR_RE = re.compile(_MONTHS + r'\s+(\d{1,2}),?\s+(\d{4})', re.IGNORECASE)
+_ABS_MONTH_DAY_RE = re.compile(_MONTHS + r'\s+(\d{1,2})(?!\s*\d)', re.IGNORECASE)
+
+# ISO: "2025-06-07 14:30", "2025-06-07T14:30"
+_ISO_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})[T ](\d{1,2}):(\d{2})')
+
+# Time only (lowercased, stripped): "2pm", "14:30", "2:30pm"
+_TIME_ONLY_RE = re.compile(r'^(\d{1,2}):?(\d{0,2})\s*(am|pm)?$')
+
+# Fallback: any run of digits
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def _apply_ampm(hour: int, am_pm) -> int:
+    """
+    Convert a 12-hour clock hour to 24-hour format
+
+    Args:
+        hour: Hour as written (1-12 with am/pm, otherwise already 24-hour)
+        am_pm: 'am', 'pm' (any case) or None
+
+    Returns:
+        Hour in 24-hour format
+    """
+    if am_pm:
+        am_pm = am_pm.lower()
+        if am_pm == 'pm' and hour != 12:
+            return hour + 12
+        if am_pm == 'am' and hour == 12:
+            return 0
+    return hour
+
+
+@functools.lru_cache(maxsize=8)
+def _last_sunday(year: int, month: int) -> date:
+    """Get the last Sunday of a given month (cached; DST only needs March and October)"""
+    # Start from the last day of the month
+    if month == 12:
+        next_month = date(year + 1, 1, 1)
+    else:
+        next_month = date(year, month + 1, 1)
+    
+    last_day = next_month - timedelta(days=1)
+    
+    # Step back to the last Sunday (weekday 6) in one subtraction
+    return last_day - timedelta(days=(last_day.weekday() - 6) % 7)
+
 
 class TimezoneService:
     """
@@ -25,6 +124,8 @@ class TimezoneService:
     def __init__(self):
         """Initialize timezone service"""
         self.current_time = None
+        # (UTC date, offset): the DST switch only happens between dates
+        self._offset_cache = None
     
     def get_current_time_cet(self) -> dict:
         """
@@ -81,27 +182,35 @@ class TimezoneService:
             offset = self._get_utc_offset_hours()
             cet_now = utc_now + timedelta(hours=offset)
             
-            # Try different parsing strategies in order
+            # Try different parsing strategies in order. Each is skipped when
+            # the string lacks a marker its pattern requires, so a miss costs
+            # a substring check instead of a regex scan; the order (and so
+            # which strategy wins) is unchanged
+            datetime_lower = datetime_str.lower()
             
             # Strategy 1: Verbose format with parentheses - "Tomorrow (2024-06-13) at 16:00 CET"
-            result = self._parse_verbose_format(datetime_str, cet_now, offset)
-            if result:
-                return result
+            if '(' in datetime_str:
+                result = self._parse_verbose_format(datetime_str, cet_now, offset)
+                if result:
+                    return result
             
             # Strategy 2: Relative dates - "tomorrow at 2pm", "Monday at 3pm", "in 2 hours"
-            result = self._parse_relative_format(datetime_str, cet_now, offset)
-            if result:
-                return result
+            if 'day' in datetime_lower or 'tomorrow' in datetime_lower or 'in' in datetime_lower:
+                result = self._parse_relative_format(datetime_str, cet_now, offset)
+                if result:
+                    return result
             
             # Strategy 3: Absolute dates - "7 June at 4pm", "June 7 at 4pm"
-            result = self._parse_absolute_format(datetime_str, cet_now, offset)
-            if result:
-                return result
+            if any(month in datetime_lower for month in _MONTH_NUMBERS):
+                result = self._parse_absolute_format(datetime_str, cet_now, offset)
+                if result:
+                    return result
             
             # Strategy 4: ISO format - "2025-06-07 14:30", "2025-06-07T14:30"
-            result = self._parse_iso_format(datetime_str, offset)
-            if result:
-                return result
+            if datetime_str.count('-') >= 2:
+                result = self._parse_iso_format(datetime_str, offset)
+                if result:
+                    return result
             
             # Strategy 5: Time only - "2pm", "14:30"
             result = self._parse_time_only(datetime_str, cet_now, offset)
@@ -127,14 +236,14 @@ class TimezoneService:
         """
         try:
             # Extract date from parentheses
-            date_match = re.search(r'\((\d{4})-(\d{2})-(\d{2})\)', datetime_str)
+            date_match = _VERBOSE_DATE_RE.search(datetime_str)
             if not date_match:
                 return None
             
             year, month, day = int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3))
             
             # Extract time
-            time_match = re.search(r'at\s+(\d{1,2}):(\d{2})', datetime_str, re.IGNORECASE)
+            time_match = _VERBOSE_TIME_RE.search(datetime_str)
             if time_match:
                 hour, minute = int(time_match.group(1)), int(time_match.group(2))
             else:
@@ -158,7 +267,7 @@ class TimezoneService:
             datetime_lower = datetime_str.lower()
             
             # Handle "in X hours/minutes"
-            in_match = re.search(r'in\s+(\d+)\s+(hours?|minutes?)', datetime_lower)
+            in_match = _IN_OFFSET_RE.search(datetime_lower)
             if in_match:
                 amount = int(in_match.group(1))
                 unit = in_match.group(2)
@@ -170,40 +279,25 @@ class TimezoneService:
             # Handle day names and relative dates
             day_offset = None
             
-            if 'tomorrow' in datetime_lower:
-                day_offset = 1
-            elif 'today' in datetime_lower:
-                day_offset = 0
-            elif 'monday' in datetime_lower:
-                day_offset = self._days_until_weekday('monday', cet_now)
-            elif 'tuesday' in datetime_lower:
-                day_offset = self._days_until_weekday('tuesday', cet_now)
-            elif 'wednesday' in datetime_lower:
-                day_offset = self._days_until_weekday('wednesday', cet_now)
-            elif 'thursday' in datetime_lower:
-                day_offset = self._days_until_weekday('thursday', cet_now)
-            elif 'friday' in datetime_lower:
-                day_offset = self._days_until_weekday('friday', cet_now)
-            elif 'saturday' in datetime_lower:
-                day_offset = self._days_until_weekday('saturday', cet_now)
-            elif 'sunday' in datetime_lower:
-                day_offset = self._days_until_weekday('sunday', cet_now)
+            # One scan finds every day word; the earliest in _RELATIVE_DAYS wins,
+            # as with the former tomorrow/today/monday/... checks in order
+            day_matches = _RELATIVE_DAY_RE.findall(datetime_lower)
+            if day_matches:
+                day = min(day_matches, key=_RELATIVE_DAY_PRIORITY.__getitem__)
+                if day == 'tomorrow':
+                    day_offset = 1
+                elif day == 'today':
+                    day_offset = 0
+                else:
+                    day_offset = self._days_until_weekday(day, cet_now)
             
             if day_offset is not None:
                 # Extract time
-                time_match = re.search(r'at\s+(\d{1,2}):?(\d{0,2})\s*(am|pm)?', datetime_lower)
+                time_match = _RELATIVE_TIME_RE.search(datetime_lower)
                 
                 if time_match:
-                    hour = int(time_match.group(1))
+                    hour = _apply_ampm(int(time_match.group(1)), time_match.group(3))
                     minute = int(time_match.group(2)) if time_match.group(2) else 0
-                    am_pm = time_match.group(3)
-                    
-                    # Convert 12-hour to 24-hour format
-                    if am_pm:
-                        if am_pm == 'pm' and hour != 12:
-                            hour += 12
-                        elif am_pm == 'am' and hour == 12:
-                            hour = 0
                 else:
                     # Default to 9:00 AM
                     hour, minute = 9, 0
@@ -226,36 +320,24 @@ class TimezoneService:
         Also handles dates without times: "20 November 2026", "November 20, 2026"
         """
         try:
-            # Try to extract date and time
-            # Pattern 1: "7 June at 4pm" or "7 June 2025 at 4pm"
-            pattern1 = r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(?:(\d{4})\s+)?at\s+(\d{1,2}):?(\d{0,2})\s*(am|pm)?'
-            match = re.search(pattern1, datetime_str, re.IGNORECASE)
+            # Pattern 1: "7 June at 4pm" or "7 June 2025 at 4pm", found together
+            # with pattern 2 ("June 7 at 4pm") in one scan
+            match = _ABS_DATE_TIME_RE.search(datetime_str)
+            month_first_match = None
+            
+            if match and not match.group('d1'):
+                # Pattern 2 matched first, but pattern 1 (even further right)
+                # and the day-first dates without a time still take precedence
+                month_first_match = match
+                match = _ABS_DAY_MONTH_TIME_RE.search(datetime_str, match.start() + 1)
             
             if match:
-                day = int(match.group(1))
-                month_str = match.group(2)
-                year = int(match.group(3)) if match.group(3) else cet_now.year
-                hour = int(match.group(4))
-                minute = int(match.group(5)) if match.group(5) else 0
-                am_pm = match.group(6)
-                
-                # Convert month string to number
-                month = self._month_to_number(month_str)
-                
-                # Convert 12-hour to 24-hour format
-                if am_pm:
-                    if am_pm.lower() == 'pm' and hour != 12:
-                        hour += 12
-                    elif am_pm.lower() == 'am' and hour == 12:
-                        hour = 0
-                
-                result = datetime(year, month, day, hour, minute, 0)
+                result = self._absolute_date_time(match, cet_now)
                 logger.debug(f"Parsed absolute format (pattern 1): {result}")
                 return result
             
             # Pattern 1b: "7 June 2025" or "20 November 2026" (date only, no time - all day event)
-            pattern1b = r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})'
-            match = re.search(pattern1b, datetime_str, re.IGNORECASE)
+            match = _ABS_DAY_MONTH_YEAR_RE.search(datetime_str)
             
             if match:
                 day = int(match.group(1))
@@ -271,8 +353,7 @@ class TimezoneService:
                 return result
             
             # Pattern 1c: "7 June" or "20 November" (date only, no year - assumes current/next year)
-            pattern1c = r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)(?!\s*\d)'
-            match = re.search(pattern1c, datetime_str, re.IGNORECASE)
+            match = _ABS_DAY_MONTH_RE.search(datetime_str)
             
             if match:
                 day = int(match.group(1))
@@ -293,34 +374,13 @@ class TimezoneService:
                 return result
             
             # Pattern 2: "June 7 at 4pm" or "June 7 2025 at 4pm"
-            pattern2 = r'(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?:\s+(\d{4}))?\s+at\s+(\d{1,2}):?(\d{0,2})\s*(am|pm)?'
-            match = re.search(pattern2, datetime_str, re.IGNORECASE)
-            
-            if match:
-                month_str = match.group(1)
-                day = int(match.group(2))
-                year = int(match.group(3)) if match.group(3) else cet_now.year
-                hour = int(match.group(4))
-                minute = int(match.group(5)) if match.group(5) else 0
-                am_pm = match.group(6)
-                
-                # Convert month string to number
-                month = self._month_to_number(month_str)
-                
-                # Convert 12-hour to 24-hour format
-                if am_pm:
-                    if am_pm.lower() == 'pm' and hour != 12:
-                        hour += 12
-                    elif am_pm.lower() == 'am' and hour == 12:
-                        hour = 0
-                
-                result = datetime(year, month, day, hour, minute, 0)
+            if month_first_match:
+                result = self._absolute_date_time(month_first_match, cet_now)
                 logger.debug(f"Parsed absolute format (pattern 2): {result}")
                 return result
             
             # Pattern 2b: "November 20, 2026" or "November 20 2026" (date only, no time)
-            pattern2b = r'(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})'
-            match = re.search(pattern2b, datetime_str, re.IGNORECASE)
+            match = _ABS_MONTH_DAY_YEAR_RE.search(datetime_str)
             
             if match:
                 month_str = match.group(1)
@@ -336,8 +396,7 @@ class TimezoneService:
                 return result
             
             # Pattern 2c: "November 20" (date only, no year)
-            pattern2c = r'(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})(?!\s*\d)'
-            match = re.search(pattern2c, datetime_str, re.IGNORECASE)
+            match = _ABS_MONTH_DAY_RE.search(datetime_str)
             
             if match:
                 month_str = match.group(1)
@@ -363,14 +422,37 @@ class TimezoneService:
             logger.debug(f"Could not parse absolute format: {str(e)}")
             return None
     
+    def _absolute_date_time(self, match, cet_now: datetime) -> datetime:
+        """
+        Build the datetime for a pattern 1 or pattern 2 (date with time) match
+        
+        Args:
+            match: Match of _ABS_DATE_TIME_RE or _ABS_DAY_MONTH_TIME_RE
+            cet_now: Current CET time, for the default year
+            
+        Returns:
+            datetime: Parsed datetime
+        """
+        if match.group('d1'):
+            day, month_str, year_str = match.group('d1', 'm1', 'y1')
+        else:
+            day, month_str, year_str = match.group('d2', 'm2', 'y2')
+        year = int(year_str) if year_str else cet_now.year
+        hour = _apply_ampm(int(match.group('h')), match.group('ap'))
+        minute = int(match.group('mn')) if match.group('mn') else 0
+        
+        # Convert month string to number
+        month = self._month_to_number(month_str)
+        
+        return datetime(year, month, int(day), hour, minute, 0)
+    
     def _parse_iso_format(self, datetime_str: str, offset: int) -> datetime:
         """
         Parse ISO format: "2025-06-07 14:30", "2025-06-07T14:30"
         """
         try:
             # Pattern: YYYY-MM-DD[T ]HH:MM
-            pattern = r'(\d{4})-(\d{2})-(\d{2})[T ](\d{1,2}):(\d{2})'
-            match = re.search(pattern, datetime_str)
+            match = _ISO_RE.search(datetime_str)
             
             if match:
                 year = int(match.group(1))
@@ -398,20 +480,11 @@ class TimezoneService:
             datetime_lower = datetime_str.lower().strip()
             
             # Pattern: HH:MM or H:MM or H or HH followed by am/pm
-            pattern = r'^(\d{1,2}):?(\d{0,2})\s*(am|pm)?$'
-            match = re.search(pattern, datetime_lower)
+            match = _TIME_ONLY_RE.search(datetime_lower)
             
             if match:
-                hour = int(match.group(1))
+                hour = _apply_ampm(int(match.group(1)), match.group(3))
                 minute = int(match.group(2)) if match.group(2) else 0
-                am_pm = match.group(3)
-                
-                # Convert 12-hour to 24-hour format
-                if am_pm:
-                    if am_pm == 'pm' and hour != 12:
-                        hour += 12
-                    elif am_pm == 'am' and hour == 12:
-                        hour = 0
                 
                 result = cet_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
                 logger.debug(f"Parsed time only: {result}")
@@ -430,7 +503,7 @@ class TimezoneService:
         try:
             # Try to extract any numbers and parse them
             # This is a very basic fallback
-            numbers = re.findall(r'\d+', datetime_str)
+            numbers = _DIGITS_RE.findall(datetime_str)
             if not numbers:
                 return None
             
@@ -463,37 +536,30 @@ class TimezoneService:
         Returns 1 for winter (CET, UTC+1) or 2 for summer (CEST, UTC+2)
         """
         try:
-            utc_now = datetime.utcnow()
+            today = datetime.utcnow().date()
+            if self._offset_cache and self._offset_cache[0] == today:
+                return self._offset_cache[1]
             
             # DST in Europe: last Sunday of March to last Sunday of October
             # For simplicity, check if we're in DST period
-            march_last_sunday = self._get_last_sunday(utc_now.year, 3)
-            october_last_sunday = self._get_last_sunday(utc_now.year, 10)
+            march_last_sunday = _last_sunday(today.year, 3)
+            october_last_sunday = _last_sunday(today.year, 10)
             
-            if march_last_sunday <= utc_now.date() < october_last_sunday:
-                return 2  # CEST (UTC+2)
+            if march_last_sunday <= today < october_last_sunday:
+                offset = 2  # CEST (UTC+2)
             else:
-                return 1  # CET (UTC+1)
+                offset = 1  # CET (UTC+1)
+            
+            self._offset_cache = (today, offset)
+            return offset
         
         except Exception as e:
             logger.warning(f"Error calculating UTC offset: {str(e)}, defaulting to UTC+1")
             return 1
     
-    def _get_last_sunday(self, year: int, month: int) -> datetime:
+    def _get_last_sunday(self, year: int, month: int) -> date:
         """Get the last Sunday of a given month"""
-        # Start from the last day of the month
-        if month == 12:
-            next_month = datetime(year + 1, 1, 1)
-        else:
-            next_month = datetime(year, month + 1, 1)
-        
-        last_day = next_month - timedelta(days=1)
-        
-        # Go back to the last Sunday
-        while last_day.weekday() != 6:  # 6 = Sunday
-            last_day -= timedelta(days=1)
-        
-        return last_day.date()
+        return _last_sunday(year, month)
     
     def _days_until_weekday(self, weekday_name: str, current_date: datetime) -> int:
         """
@@ -529,19 +595,5 @@ class TimezoneService:
         return days_ahead
     
     def _month_to_number(self, month_str: str) -> int:
-        """Convert month name to number"""
-        months = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12,
-        }
-        return months.get(month_str.lower(), 1)
+        """Convert month name (full or abbreviated) to number"""
+        return _MONTH_NUMBERS.get(month_str[:3].lower(), 1)
@@ -17,6 +17,18 @@ from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# pybase64 (SIMD libbase64) is a drop-in, several times faster replacement
+# for the stdlib base64 codec
+try:
+    import pybase64
+    _b64encode = pybase64.b64encode
+    _b64decode = pybase64.b64decode
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    _b64encode = base64.b64encode
+    _b64decode = base64.b64decode
+    PYBASE64_AVAILABLE = False
+
 
 class TokenManager:
     """Manages encoding and decoding of Google tokens"""
@@ -43,14 +55,14 @@ class TokenManager:
             json_str = json.dumps(token_dict)
             
             # Encode to Base64
-            base64_bytes = base64.b64encode(json_str.encode('utf-8'))
+            base64_bytes = _b64encode(json_str.encode('utf-8'))
             base64_str = base64_bytes.decode('utf-8')
             
             logger.info("✅ Token encoded to Base64 successfully")
             return base64_str
         
         except Exception as e:
-            logger.error(f"❌ Error encoding token: {e}")
+            logger.error("❌ Error encoding token: %s", e)
             raise ValueError(f"Failed to encode token: {str(e)}")
     
     @staticmethod
@@ -73,7 +85,7 @@ class TokenManager:
             
             # Decode from Base64
             base64_bytes = base64_str.encode('utf-8')
-            json_bytes = base64.b64decode(base64_bytes)
+            json_bytes = _b64decode(base64_bytes)
             json_str = json_bytes.decode('utf-8')
             
             # Parse JSON
@@ -83,7 +95,7 @@ class TokenManager:
             return token_dict
         
         except Exception as e:
-            logger.error(f"❌ Error decoding token: {e}")
+            logger.error("❌ Error decoding token: %s", e)
             raise ValueError(f"Failed to decode token: {str(e)}")
     
     @staticmethod
@@ -102,19 +114,26 @@ class TokenManager:
             ValueError: If file is not valid JSON
         """
         try:
-            with open(file_path, 'r') as f:
-                token_dict = json.load(f)
+            with open(file_path, 'rb') as f:
+                json_bytes = f.read()
+            
+            # Parse only to validate; the file bytes are encoded as-is instead
+            # of being re-serialized with json.dumps
+            if not isinstance(json.loads(json_bytes), dict):
+                raise ValueError("Token must be a dictionary")
             
-            return TokenManager.encode_token(token_dict)
+            base64_str = _b64encode(json_bytes).decode('ascii')
+            logger.info("✅ Token encoded to Base64 successfully")
+            return base64_str
         
         except FileNotFoundError:
-            logger.error(f"❌ Token file not found: {file_path}")
+            logger.error("❌ Token file not found: %s", file_path)
             raise
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Invalid JSON in token file: {e}")
+            logger.error("❌ Invalid JSON in token file: %s", e)
             raise ValueError(f"Invalid JSON in token file: {str(e)}")
         except Exception as e:
-            logger.error(f"❌ Error reading token file: {e}")
+            logger.error("❌ Error reading token file: %s", e)
             raise
     
     @staticmethod
@@ -136,10 +155,10 @@ class TokenManager:
             with open(file_path, 'w') as f:
                 json.dump(token_dict, f, indent=2)
             
-            logger.info(f"✅ Token written to file: {file_path}")
+            logger.info("✅ Token written to file: %s", file_path)
         
         except Exception as e:
-            logger.error(f"❌ Error writing token to file: {e}")
+            logger.error("❌ Error writing token to file: %s", e)
             raise
     
     @staticmethod
@@ -161,7 +180,7 @@ class TokenManager:
         
         for field in required_fields:
             if field not in token_dict:
-                logger.warning(f"Token missing required field: {field}")
+                logger.warning("Token missing required field: %s", field)
                 return False
         
         return True
@@ -181,7 +200,7 @@ class TokenManager:
             token_dict = TokenManager.decode_token(base64_str)
             return TokenManager.validate_token(token_dict)
         except Exception as e:
-            logger.warning(f"Invalid Base64 token: {e}")
+            logger.warning("Invalid Base64 token: %s", e)
             return False
     
     @staticmethod
@@ -208,7 +227,7 @@ class TokenManager:
             }
         
         except Exception as e:
-            logger.warning(f"Error getting token info: {e}")
+            logger.warning("Error getting token info: %s", e)
             return None
 
 
@@ -270,16 +289,16 @@ if __name__ == '__main__':
     
     # Encode
     encoded = encode_token(example_token)
-    logger.info(f"Encoded token: {encoded[:50]}...")
+    logger.info("Encoded token: %s...", encoded[:50])
     
     # Decode
     decoded = decode_token(encoded)
-    logger.info(f"Decoded token type: {decoded.get('type')}")
+    logger.info("Decoded token type: %s", decoded.get('type'))
     
     # Validate
     is_valid = validate_base64_token(encoded)
-    logger.info(f"Token is valid: {is_valid}")
+    logger.info("Token is valid: %s", is_valid)
     
     # Get info
     info = get_token_info(encoded)
-    logger.info(f"Token info: {info}")
+    logger.info("Token info: %s", info)
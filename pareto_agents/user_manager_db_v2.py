@@ -11,6 +11,8 @@ import json
 import logging
 from typing import Optional, Dict, Any
 
+from sqlalchemy.orm import raiseload
+
 from .database import get_db_session, User
 from .token_manager import TokenManager
 
@@ -68,7 +70,7 @@ class UserManagerDBv2:
                     return self._user_to_dict(user)
             
             # Log all users for debugging
-            all_users = session.query(User).all()
+            all_users = session.query(User).options(raiseload('*')).all()
             logger.warning(f"❌ User not found. Total users in DB: {len(all_users)}")
             for u in all_users:
                 logger.warning(f"   DB User: ID={u.id}, Phone='{u.phone_number}', Enabled={u.is_enabled}")